@@ -0,0 +1,307 @@
+"""
+Persistent index of the experiments stored below a data directory.
+
+Crawling large directory trees and reading every expt_log.txt can take
+minutes on a network drive. :class:`ExperimentCatalog` keeps the log fields,
+paths, file counts, and last analysis time of every experiment in a SQLite
+file (expt_catalog.db) in the data directory. Refreshing only rereads
+directories whose modification time changed since the last refresh.
+
+Example
+-------
+>>> catalog = ExperimentCatalog('C:/Users/user/Data/20230504_sample')
+>>> catalog.refresh()
+>>> catalog.find(expt_type='temp_sweep', sample_name='sample_x', temp=300)
+"""
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from catalight.analysis.tools import (list_expt_obj, list_matching_files,
+                                      scan_step_dirs, select_data_files)
+from catalight.equipment.experiment_control import Experiment
+
+_LIST_FIELDS = ['temp', 'power', 'wavelength', 'bandwidth',
+                'gas_type', 'gas_comp', 'tot_flow']
+"""list[str]: Experiment attributes holding lists, saved as json text."""
+
+_CONDITION_FIELDS = ['temp', 'power', 'wavelength', 'bandwidth', 'tot_flow']
+"""list[str]: Numeric list attributes searchable with ExperimentCatalog.find"""
+
+_FIELDS = ['date', 'start_time', 'expt_type', 'expt_name', 'sample_name',
+           *_LIST_FIELDS, 'sample_rate', 't_steady_state', 't_buffer']
+"""list[str]: Experiment attributes saved in the catalog."""
+
+
+class ExperimentCatalog():
+    """
+    SQLite index of all experiments within a data directory.
+
+    Each row of the experiments table describes one expt_log.txt and holds the
+    experiment attributes listed in _FIELDS, data_path, results_path,
+    num_data_files (number of FID .asc files run_analysis will process, see
+    :func:`~catalight.analysis.tools.scan_step_dirs`), and last_analysis (time
+    avg_conc.csv was last written, None if not analyzed).
+
+    Parameters
+    ----------
+    root : str
+        Data directory to index. The catalog is saved in this directory.
+    db_name : `str`, optional
+        File name of the catalog. The default is 'expt_catalog.db'.
+    """
+
+    def __init__(self, root, db_name='expt_catalog.db'):
+        self.root = os.path.abspath(root)
+        """Data directory indexed by the catalog"""
+        self.db_path = os.path.join(self.root, db_name)
+        """Full path to the SQLite file"""
+        with self._connect() as con:
+            con.execute('CREATE TABLE IF NOT EXISTS dirs ('
+                        'path TEXT PRIMARY KEY, mtime INTEGER, '
+                        'subdirs TEXT, is_expt INTEGER)')
+            field_cols = ', '.join(field + ' TEXT' for field in _FIELDS)
+            con.execute('CREATE TABLE IF NOT EXISTS experiments ('
+                        'log_path TEXT PRIMARY KEY, expt_dir TEXT, '
+                        + field_cols + ', data_path TEXT, '
+                        'results_path TEXT, log_mtime INTEGER, '
+                        'data_mtime INTEGER, num_data_files INTEGER, '
+                        'last_analysis REAL)')
+
+    @contextmanager
+    def _connect(self):
+        """Open connection to the catalog, commit and close when done."""
+        con = sqlite3.connect(self.db_path)
+        try:
+            with con:  # Commits, or rolls back on error
+                yield con
+        finally:
+            con.close()
+
+    def refresh(self):
+        """
+        Update the catalog to match the files in the root directory.
+
+        Directories whose modification time is unchanged are not listed
+        again, and directories below an experiment folder are only checked
+        for new data files. Experiments whose expt_log.txt was removed are
+        dropped from the catalog.
+
+        Returns
+        -------
+        int
+            Number of experiments added or updated.
+        """
+        with self._connect() as con:
+            known_dirs = {path: (mtime, json.loads(subdirs), is_expt)
+                          for path, mtime, subdirs, is_expt
+                          in con.execute('SELECT * FROM dirs')}
+            known_expts = {row[0]: row[1:] for row in con.execute(
+                'SELECT log_path, log_mtime, data_mtime FROM experiments')}
+            seen_dirs = set()
+            seen_logs = set()
+            num_updated = 0
+            stack = [self.root]
+            while stack:
+                path = stack.pop()
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:  # Removed during refresh
+                    continue
+                seen_dirs.add(path)
+                if path in known_dirs and known_dirs[path][0] == mtime:
+                    _, subdirs, is_expt = known_dirs[path]
+                else:
+                    subdirs, is_expt = self._scan_dir(path)
+                    con.execute('INSERT OR REPLACE INTO dirs VALUES '
+                                '(?, ?, ?, ?)',
+                                (path, mtime, json.dumps(subdirs), is_expt))
+                if is_expt:
+                    # Experiments aren't nested, don't search the data
+                    log_path = os.path.join(path, 'expt_log.txt')
+                    seen_logs.add(log_path)
+                    num_updated += self._update_expt(
+                        con, log_path, known_expts.get(log_path))
+                else:
+                    stack.extend(os.path.join(path, name)
+                                 for name in subdirs)
+
+            # Forget directories and experiments that no longer exist
+            for path in set(known_dirs) - seen_dirs:
+                con.execute('DELETE FROM dirs WHERE path = ?', (path,))
+            for log_path in set(known_expts) - seen_logs:
+                con.execute('DELETE FROM experiments WHERE log_path = ?',
+                            (log_path,))
+        return num_updated
+
+    @staticmethod
+    def _scan_dir(path):
+        """Return (list of subdirectory names, has expt_log.txt)."""
+        subdirs = []
+        is_expt = False
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.name == 'expt_log.txt':
+                    is_expt = True
+        return sorted(subdirs), is_expt
+
+    @staticmethod
+    def _data_mtime(data_path):
+        """Return latest mtime of data folder and step folders, or None."""
+        if not os.path.isdir(data_path):
+            return None
+        mtimes = [os.stat(data_path).st_mtime_ns]
+        with os.scandir(data_path) as entries:
+            mtimes += [entry.stat().st_mtime_ns for entry in entries
+                       if entry.is_dir()]
+        return max(mtimes)
+
+    def _update_expt(self, con, log_path, known):
+        """Update catalog row of one experiment, return 1 if changed."""
+        expt_dir = os.path.dirname(log_path)
+        log_mtime = os.stat(log_path).st_mtime_ns
+        data_path = os.path.join(expt_dir, 'Data')
+        results_path = os.path.join(expt_dir, 'Results')
+        data_mtime = self._data_mtime(data_path)
+        avg_path = os.path.join(results_path, 'avg_conc.csv')
+        last_analysis = (os.stat(avg_path).st_mtime
+                         if os.path.isfile(avg_path) else None)
+
+        if known is not None and known == (log_mtime, data_mtime):
+            # Only the analysis can have changed
+            con.execute('UPDATE experiments SET last_analysis = ? '
+                        'WHERE log_path = ?', (last_analysis, log_path))
+            return 0
+
+        expt = Experiment()
+        try:
+            expt.read_expt_log(log_path)
+        except Exception as e:
+            print('Could not read', log_path, e)
+            return 0
+        values = [json.dumps(getattr(expt, field))
+                  if field in _LIST_FIELDS else str(getattr(expt, field))
+                  for field in _FIELDS]
+        if data_mtime is None:
+            num_data_files = 0
+        else:
+            num_data_files = sum(len(select_data_files(files))
+                                 for files
+                                 in scan_step_dirs(data_path).values())
+        con.execute('INSERT OR REPLACE INTO experiments VALUES ('
+                    + ', '.join(['?'] * (len(_FIELDS) + 8)) + ')',
+                    (log_path, expt_dir, *values, data_path, results_path,
+                     log_mtime, data_mtime, num_data_files, last_analysis))
+        return 1
+
+    def find(self, expt_type=None, sample_name=None, analyzed=None,
+             **conditions):
+        """
+        Query the catalog for matching experiments.
+
+        Call :meth:`refresh` first to include recent changes.
+
+        Parameters
+        ----------
+        expt_type : `str`, optional
+            Only return experiments of this type e.g. 'temp_sweep'.
+            The default is None (any).
+        sample_name : `str`, optional
+            Only return experiments of this sample. Accepts SQL LIKE
+            wildcards, e.g. '%AgPd%'. The default is None (any).
+        analyzed : `bool`, optional
+            True only returns experiments with avg_conc.csv, False only
+            returns experiments without. The default is None (any).
+        **conditions : float
+            Experiment attribute and value that must appear in that attribute,
+            e.g. temp=300 returns experiments that include 300 in expt.temp.
+            Accepts temp, power, wavelength, bandwidth, and tot_flow.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per matching experiment, indexed by log_path.
+        """
+        query = 'SELECT * FROM experiments WHERE 1'
+        params = []
+        if expt_type is not None:
+            query += ' AND expt_type = ?'
+            params.append(expt_type)
+        if sample_name is not None:
+            query += ' AND sample_name LIKE ?'
+            params.append(sample_name)
+        if analyzed is not None:
+            query += (' AND last_analysis IS NOT NULL' if analyzed
+                      else ' AND last_analysis IS NULL')
+        with self._connect() as con:
+            expts = pd.read_sql_query(query + ' ORDER BY log_path', con,
+                                      params=params, index_col='log_path')
+
+        for field, value in conditions.items():
+            if field not in _CONDITION_FIELDS:
+                raise ValueError(field + ' is not a searchable condition')
+            has_value = [bool(np.isclose(json.loads(values), value).any())
+                         for values in expts[field]]
+            expts = expts[has_value]
+        return expts
+
+    def find_expts(self, **kwargs):
+        """
+        Return Experiment objects of experiments matching :meth:`find`.
+
+        Parameters
+        ----------
+        **kwargs
+            Search criteria passed to :meth:`find`.
+
+        Returns
+        -------
+        list[Experiment]
+            Experiments read from the matching expt_log.txt files.
+        """
+        return list_expt_obj(self.find(**kwargs).index.tolist())
+
+    def list_logs(self):
+        """Return full paths of all expt_log.txt files in the catalog."""
+        with self._connect() as con:
+            return [row[0] for row in con.execute(
+                'SELECT log_path FROM experiments ORDER BY log_path')]
+
+
+def list_expt_logs(main_dirs):
+    """
+    List expt_log.txt files using the catalog of each directory.
+
+    Drop in replacement for list_matching_files(main_dirs, 'expt_log',
+    '.txt') that refreshes and reads an :class:`ExperimentCatalog` instead of
+    crawling every directory. Directories where the catalog can't be saved,
+    e.g. read-only shares, are crawled instead.
+
+    Parameters
+    ----------
+    main_dirs : str or list[str]
+        Data directories to list experiments from.
+
+    Returns
+    -------
+    list[str]
+        Full paths to expt_log.txt files.
+    """
+    if isinstance(main_dirs, str):
+        main_dirs = [main_dirs]
+    log_paths = []
+    for main_dir in main_dirs:
+        try:
+            catalog = ExperimentCatalog(main_dir)
+            catalog.refresh()
+            log_paths += catalog.list_logs()
+        except sqlite3.Error as e:
+            print('Could not use catalog of', main_dir, e)
+            log_paths += list_matching_files(main_dir, 'expt_log', '.txt')
+    return log_paths
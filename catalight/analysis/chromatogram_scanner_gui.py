@@ -35,6 +35,7 @@ class MainWindow(QMainWindow):
         self.options_layout = QGridLayout()
         self.bc_box = QCheckBox("baseline correction?")
         self.int_box = QCheckBox("Plot integration bounds?")
+        self.prune_box = QCheckBox("Skip results/figures/images folders?")
         self.target_entry = QComboBox()
         self.target_entry.addItems(['FID', 'TCD'])
         self.suffix_entry = QLineEdit('.asc')
@@ -44,6 +45,7 @@ class MainWindow(QMainWindow):
         # Assemble options to layout
         self.options_layout.addWidget(self.bc_box, 0, 0)
         self.options_layout.addWidget(self.int_box, 1, 0)
+        self.options_layout.addWidget(self.prune_box, 2, 0)
         self.options_layout.addWidget(self.target_label, 0, 1)
         self.options_layout.addWidget(self.target_entry, 1, 1)
         self.options_layout.addWidget(self.suffix_label, 0, 2)
@@ -65,6 +67,7 @@ class MainWindow(QMainWindow):
         self.suffix_entry.editingFinished.connect(self.get_files)
         self.bc_box.clicked.connect(self.update_plot)
         self.int_box.clicked.connect(self.update_plot)
+        self.prune_box.clicked.connect(self.get_files)
 
         # Get main directory containing data files
         self.folderpath = QFileDialog \
@@ -76,10 +79,18 @@ class MainWindow(QMainWindow):
     def get_files(self):
         """List user's desired files and add to listWidget."""
         # Populate list with all datafiles in selected folder based on options
-        filematch_args = ([self.folderpath],
-                          self.target_entry.currentText(),
-                          self.suffix_entry.text())
-        self.filelist = analysis_tools.list_matching_files(*filematch_args)
+        channel = self.target_entry.currentText()
+        suffix = self.suffix_entry.text().lower()
+        # Lists files in every subfolder unless user chooses to skip some
+        prune = ()
+        if self.prune_box.isChecked():
+            prune = analysis_tools.PRUNED_DIRS
+        data_dirs = analysis_tools.scan_data_dirs(self.folderpath,
+                                                  channels=(channel,),
+                                                  suffixes=(suffix,),
+                                                  prune=prune)
+        self.filelist = [filepath for files in data_dirs.values()
+                         for filepath in files[(channel, suffix)]]
         if not self.filelist:
             print('No matching files found in folder')
         self.listWidget.clear()  # Make sure widget is empty
@@ -91,12 +102,11 @@ class MainWindow(QMainWindow):
         # Get data from filepath
         path = self.listWidget.item(0).text()
         data = GCData(path, basecorrect=False)
-        datacorr = GCData(path, basecorrect=True)
-        # Plot pulled data
-        self.data_line = self.graphWidget.plot(data.time, data.signal,
+        # Plot pulled data, corrected line is filled in by update_plot
+        self.data_line = self.graphWidget.plot(data.time, data.raw_signal,
                                                pen=self.pen1, name="raw")
-        self.data_line_corr = self.graphWidget.plot(datacorr.time,
-                                                    datacorr.signal,
+        self.data_line_corr = self.graphWidget.plot(data.time,
+                                                    data.raw_signal,
                                                     pen=self.pen2,
                                                     name="corrected")
         self.data_line_left = self.graphWidget.plot([0],[0],pen=None, symbol='o', name="left indices")
@@ -136,8 +146,8 @@ class MainWindow(QMainWindow):
             return
 
         path = self.listWidget.currentItem().text()
-        data = GCData(path, basecorrect=False)
-        datacorr = GCData(path, basecorrect=True)
+        # Peaks and baseline are only computed if requested by options below
+        data = GCData(path, basecorrect=self.bc_box.isChecked())
         num = self.filelist.index(path)
 
         # Update title of graph
@@ -145,28 +155,24 @@ class MainWindow(QMainWindow):
                                   color="k", size="18pt")
 
         # Update data, check if baseline correction is needed
-        self.data_line.setData(data.time, data.signal,
+        self.data_line.setData(data.time, data.raw_signal,
                                pen=self.pen1, name="raw")
         if self.int_box.isChecked():
-            if self.bc_box.isChecked():
-                data_ind = datacorr
-            else:
-                data_ind = data
             if self.data_line_left not in self.graphWidget.listDataItems():
                 self.graphWidget.addItem(self.data_line_left)
                 self.graphWidget.addItem(self.data_line_right)
                 self.graphWidget.addItem(self.data_line_apex)
 
-            [left_idx, right_idx] = (np.rint(data_ind.lind).astype('int'), np.rint(data_ind.rind).astype('int'))
+            [left_idx, right_idx] = (np.rint(data.lind).astype('int'), np.rint(data.rind).astype('int'))
             apex_idx = data.apex_ind
-            self.data_line_left.setData(data_ind.time[left_idx], data_ind.signal[left_idx],
+            self.data_line_left.setData(data.time[left_idx], data.signal[left_idx],
                                         pen=None,symbolBrush=(216,27,96),
                                         symbol='o',symbolSize = 6,
                                         name="left indices")
-            self.data_line_right.setData(data_ind.time[right_idx], data_ind.signal[right_idx],
+            self.data_line_right.setData(data.time[right_idx], data.signal[right_idx],
                                         pen=None,symbolBrush=(42,164,56),
                                         symbol='o',symbolSize = 6)
-            self.data_line_apex.setData(data_ind.time[apex_idx], data_ind.signal[apex_idx],
+            self.data_line_apex.setData(data.time[apex_idx], data.signal[apex_idx],
                                         pen=None,symbolBrush=(76,206,241),
                                         symbol='o',symbolSize = 6)
 
@@ -179,7 +185,7 @@ class MainWindow(QMainWindow):
             if self.data_line_corr not in self.graphWidget.listDataItems() :
                 self.graphWidget.addItem(self.data_line_corr)
 
-            self.data_line_corr.setData(datacorr.time, datacorr.signal,
+            self.data_line_corr.setData(data.time, data.signal,
                                         pen=self.pen2, name="corrected")
         else:
             #self.data_line_corr.clear()
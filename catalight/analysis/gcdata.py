@@ -7,6 +7,7 @@ by this class, then processed data for an experiment is
 compiled, analyzed, and plotted elsewhere.
 """
 import datetime as dt
+import hashlib
 import os
 
 import matplotlib.pyplot as plt
@@ -23,15 +24,21 @@ class GCData:
     Attributes
     ----------
     filepath : (str)
-        filepath where data is stored (.ASC file)
+        filepath where data is stored (.ASC or .CHR file)
     timestamp : (float)
         time since the epoch in seconds
     rawdata : pandas.DataFrame
-        contains time and signal values from GC run
+        contains time and signal values from GC run. Built on request from
+        time and raw_signal arrays.
     time : numpy.ndarray
-        np array version of time axis from rawdata (in minutes)
+        time axis of GC run (in minutes)
+    raw_signal : numpy.ndarray
+        signal values of GC run as read from file (in V)
+    basecorrect : bool
+        whether signal is baseline corrected. Changing this value clears all
+        processed values so they are recomputed on next access.
     signal : numpy.ndarray
-        np array version of time axis from rawdata.
+        np array version of raw_signal.
         If basecorrect=True, it will be baseline
         corrected using baseline_correct()
     apex_ind : numpy.ndarray
@@ -42,6 +49,11 @@ class GCData:
         indices of leftmost bound for integration for each peak identified
     rind : numpy.ndarray
         indices of rightmost bound for integration for each peak identified
+    counts : numpy.ndarray
+        integrated counts for each peak identified, from integrate_peak()
+
+    Processed values (signal through counts) are computed the first time they
+    are accessed and stored until a processing parameter changes.
     """
     # Dev note: don't replicate this doc style. See experiment_control
     # for better rendering reference on doc style.
@@ -54,76 +66,158 @@ class GCData:
         Parameters
         ----------
         filepath : str
-            full path to the acsii file
+            full path to the acsii (.ASC) or binary (.CHR) file
         basecorrect : bool
             set basecorrect to True if you want correction, default is false
         """
         self.filepath = filepath
-        self.timestamp, self.rawdata = self.getrawdata()
-        self.time = np.asarray(self.rawdata['Time'])  # in minutes
-        if basecorrect:
-            self.signal = self.baseline_correction()
-        else:
-            self.signal = np.asarray(self.rawdata['Signal'])
-        self.apex_ind = self.apex_inds()
-        self.numpeaks = len(self.apex_ind)
-        self.lind, self.rind = self.integration_inds()
+        self.timestamp, self.time, self.raw_signal = self.getrawdata()
+        self._cache = {}
+        self.basecorrect = basecorrect
+
+    @property
+    def basecorrect(self):
+        """bool: Baseline correct signal. Setting clears processed values."""
+        return self._basecorrect
+
+    @basecorrect.setter
+    def basecorrect(self, value):
+        self._basecorrect = value
+        self._cache.clear()
+
+    def _cached(self, name, compute):
+        """Return cached value of name, calling compute() if not present."""
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    @property
+    def signal(self):
+        """numpy.ndarray: Signal used for processing, see basecorrect."""
+        if self.basecorrect:
+            return self._cached('signal', self.baseline_correction)
+        return self.raw_signal
+
+    @property
+    def apex_ind(self):
+        """numpy.ndarray: Indices of all peaks identified by apex_inds()."""
+        return self._cached('apex_ind', self.apex_inds)
+
+    @property
+    def numpeaks(self):
+        """int: Length of apex_ind."""
+        return len(self.apex_ind)
+
+    @property
+    def lind(self):
+        """numpy.ndarray: Left integration bounds from integration_inds()."""
+        return self._cached('bounds', self.integration_inds)[0]
+
+    @property
+    def rind(self):
+        """numpy.ndarray: Right integration bounds from integration_inds()."""
+        return self._cached('bounds', self.integration_inds)[1]
+
+    @property
+    def counts(self):
+        """numpy.ndarray: Integrated counts of peaks from integrate_peak()."""
+        return self._cached('counts', self.integrate_peak)
+
+    @property
+    def rawdata(self):
+        """
+        pandas.DataFrame: 'Time' (min) and 'Signal' (arb units) of GC run.
+
+        Built from :attr:`time` and :attr:`raw_signal` each time it is called.
+        """
+        return pd.DataFrame({'Time': self.time, 'Signal': self.raw_signal})
 
     def getrawdata(self):
         """
-        Read data from ASCII, returns pandas dataframe.
+        Read data from ASCII or binary file, returns numpy arrays.
 
         Uses Matthias Richter's example code (translated from Matlab)
-        to read GC .ASC files
+        to read GC file headers. The data format is chosen from the file
+        extension. For .ASC files the data body is parsed in a single
+        vectorized call to numpy.loadtxt. For binary .CHR files the data body
+        is read directly as little-endian 32 bit integers.
 
         Returns
         -------
-        tuple(float, pandas.DataFrame)
-            (timestamp, [Elution Time, GC Signal])
+        tuple(float, numpy.ndarray, numpy.ndarray)
+            (timestamp, Elution Time, GC Signal)
             First element is timestamp in time since epoch. Second element is
-            pandas.DataFrame containing 'Time' (min) and 'Signal' (arb units)
-        """
-        with open(self.filepath, 'r') as f:
-            # Skip first 18 lines
-            for i in range(18):
-                next(f)
-            # Line 19, date
-            [month, day, year] = [int(i.strip()) for i in
-                                  f.readline().split("=")[1].split('-')]
-            # Line 20, time
-            [hr, minute, second] = [int(i.strip()) for i in
-                                    f.readline().split("=")[1].split(':')]
-            timestamp = dt.datetime(year, month, day,
-                                    hr, minute, second).timestamp()
-            # Line 21, sampling rate
-            rate = int(f.readline().split('=')[1][0])
-            # Line 22 # of data points
-            size = int(f.readline().split("=")[1])
-            # Skip next 3 lines
-            for i in range(3):
-                next(f)
-
-            y = []
-            for line in f:
-                if line.strip() == '':  # Empty strings in between entries
-                    next
-                elif "IPOINT" in line:  # Ignore IPOINT numbers at the bottom
-                    next
-                else:
-                    value = int(line.strip().split(',')[0])
-                    y.append(value / 1000)  # Convert mV to V
-
-            x = np.linspace(0, 1 / rate / 60 * (size - 1), num=size).tolist()
-            raw_data = pd.DataFrame({'Time': x, 'Signal': y})
-            GC_data = (timestamp, raw_data)
-        return GC_data
+            elution time (min) and third is GC signal (arb units)
+        """
+        if self.filepath.lower().endswith('.chr'):
+            with open(self.filepath, 'rb') as f:
+                timestamp, rate, size = self._read_header(f)
+                # Skip next 3 lines
+                for i in range(3):
+                    f.readline()
+                # Data is stored as int32 mV values directly after header
+                values = np.frombuffer(f.read(4 * size), dtype='<i4')
+        else:
+            with open(self.filepath, 'r') as f:
+                timestamp, rate, size = self._read_header(f)
+                # Skip next 3 lines
+                for i in range(3):
+                    next(f)
+                # Read first column of remaining lines in one pass. Blank
+                # lines between entries are skipped and everything after
+                # "IPOINT" (peak table at the bottom) is treated as a comment.
+                values = np.loadtxt(f, dtype=np.int64, delimiter=',',
+                                    usecols=0, comments='IPOINT', ndmin=1)
+
+        signal = values / 1000  # Convert mV to V
+        time = np.linspace(0, 1 / rate / 60 * (size - 1), num=size)
+        return (timestamp, time, signal)
+
+    @staticmethod
+    def _read_header(f):
+        """
+        Read first 22 lines of PeakSimple file header.
+
+        Header is shared by .ASC and .CHR files. Works for files opened in
+        text or binary mode. Stops reading after the line holding the number
+        of data points, the 3 remaining header lines are left unread.
+
+        Parameters
+        ----------
+        f : file object
+            Open GC data file positioned at the first line.
+
+        Returns
+        -------
+        tuple(float, int, int)
+            (timestamp, sampling rate (Hz), number of data points)
+        """
+        header = []
+        for i in range(22):
+            line = f.readline()
+            if isinstance(line, bytes):
+                line = line.decode('latin-1')
+            header.append(line)
+        # Line 19, date
+        [month, day, year] = [int(i.strip()) for i in
+                              header[18].split("=")[1].split('-')]
+        # Line 20, time
+        [hr, minute, second] = [int(i.strip()) for i in
+                                header[19].split("=")[1].split(':')]
+        timestamp = dt.datetime(year, month, day,
+                                hr, minute, second).timestamp()
+        # Line 21, sampling rate
+        rate = int(header[20].split('=')[1][0])
+        # Line 22 # of data points
+        size = int(header[21].split("=")[1])
+        return (timestamp, rate, size)
 
     # Processing functions
     ###########################################################################
 
     def baseline_correction(self):
         """
-        Get self.signal, output signal with background subtraction.
+        Get self.raw_signal, output signal with background subtraction.
 
         Uses tophat filter, based on PyMassSpec/pyms/TopHat.py
 
@@ -132,14 +226,14 @@ class GCData:
         numpy.ndarray
             GC signal with baseline corrected
         """
-        self.signal = np.asarray(self.rawdata['Signal'])
+        signal = self.raw_signal
         # default struct element as frac of tot num points
         struct_elm_frac = 0.1
-        struct_pts = int(round(self.signal.size * struct_elm_frac))
+        struct_pts = int(round(signal.size * struct_elm_frac))
         str_el = np.repeat([1], struct_pts)
         line = nd.generate_binary_structure(rank=1, connectivity=9)  # noqa
         # structure = line
-        signal_basesub = nd.white_tophat(input=self.signal, footprint=str_el)
+        signal_basesub = nd.white_tophat(input=signal, footprint=str_el)
         return signal_basesub
 
     def apex_inds(self):
@@ -158,7 +252,8 @@ class GCData:
         """
         Find bounds of integration for apexes.
 
-        Edge values determined by self._half_index_search.
+        Edge values determined by self._half_index_search, which searches from
+        all apexes at once.
         Output in the same (time) order as the apex_ind array with the location
         (index) of the left and right points for integration
 
@@ -170,24 +265,18 @@ class GCData:
             Right bounds of integration.
 
         """
-        lind = np.zeros(len(self.apex_ind))
-        rind = np.zeros(len(self.apex_ind))
-        k = 0
-
-        for apex in self.apex_ind:
-            # select all of the data just past the apex
-            lhs = self.signal[:apex + 1]
-            # reverse list so that working forward works toward the left
-            flhs = np.flip(lhs)
-            lind[k] = apex - self._half_index_search(flhs)
-            rhs = self.signal[apex - 1:]
-            rind[k] = apex + self._half_index_search(rhs)
-            k += 1
+        apex_ind = self.apex_ind
+        # Search right starting just before each apex
+        rind = apex_ind + self._half_index_search(self.signal, apex_ind - 1)
+        # reverse signal so that working forward works toward the left
+        flipped = np.flip(self.signal)
+        lind = apex_ind - self._half_index_search(flipped,
+                                                  flipped.size - 1 - apex_ind)
 
         return lind.astype(int), rind.astype(int)
 
     @staticmethod
-    def _half_index_search(dat, tol=0.1):
+    def _half_index_search(dat, starts, tol=0.1):
         """
         Support function for integration_inds to search for integration bounds.
 
@@ -202,60 +291,147 @@ class GCData:
         by Andrew Isaac and Sean O'Callaghan
         `<https://github.com/ma-bio21/pyms/blob/master/pyms/Peak/Function.py>`_
 
+        The search is performed for every starting index at once. Stopping
+        conditions 1 and 2 only depend on the position in dat (except for the
+        first step), so they are evaluated once for the full array and each
+        bound is the next stopping position after its start.
+
         Parameters
         ----------
+        dat : numpy.ndarray
+            Signal to search through, moving towards increasing index.
+        starts : numpy.ndarray of int
+            Indices of dat to start each search from.
         tol: `float`, optional
             Tolerance in percent. Summing stops when change in sum is
             less than tol percent of the current area.
 
         Returns
         -------
-        int
-            index of the integration bound
+        numpy.ndarray of int
+            number of points between each start and its integration bound
         """
         # convert from percent, not sure why it should also be halved
         tol = tol / 200.0
         # number of points to sum new area across
         # (increasing value increases smoothing)
         wide = 10
-        sig = dat[0]
         limit = len(dat)
-        index = 1
+        starts = np.asarray(starts, dtype=int)
         # edge is average value of num of pts defined by wide (NOT an index)
-        edge = float(sum(dat[0:wide])) / wide
-        delta = sig - edge
-        # make sure old_edge starts as larger than the current edge
-        old_edge = 2 * edge
+        # starting at each point. Points are added in the same order as the
+        # builtin sum() so values match a point by point search exactly.
+        window_sum = np.zeros(limit)
+        for j in range(min(wide, limit)):
+            window_sum[:limit - j] += dat[j:]
+        edge = window_sum / wide
+        delta = dat - edge
+        big_change = np.abs(delta) > dat * tol
         # look for change is large, edge going down, limit not hit
-        while abs(delta) > sig * tol and edge < old_edge and index < limit:
-            old_edge = edge
-            sig = dat[index]
-            edge = float(sum(dat[index:index + wide])) / wide
-            delta = sig - edge
-            index += 1
-
-        index -= 1
+        keep_going = big_change.copy()
+        keep_going[1:] &= edge[1:] < edge[:-1]
+        keep_going[-1] = False
+        stops = np.flatnonzero(~keep_going)
+
+        # First step compares to 2 * edge instead of the previous edge
+        first_step = (big_change[starts]
+                      & (edge[starts] < 2 * edge[starts])
+                      & (starts < limit - 1))
+        # Find first stopping point after each start
+        next_stop = np.searchsorted(stops, starts, side='right')
+        next_stop = stops[np.minimum(next_stop, stops.size - 1)]
+        index = np.where(first_step, next_stop - starts, 0)
         return index
 
+    def cumulative_area(self):
+        """
+        Compute running trapezoidal integral of signal.
+
+        Element k is the area from the first point up to point k in units of
+        seconds*signal intensity. The area between any two points i < j is
+        then cum_area[j] - cum_area[i].
+
+        Returns
+        -------
+        numpy.ndarray
+            cumulative area, same length as signal
+        """
+        x = 60 * self.time
+        y = self.signal
+        trapezoids = np.diff(x) * (y[1:] + y[:-1]) / 2.0
+        return np.concatenate(([0.0], np.cumsum(trapezoids)))
+
+    @property
+    def cum_area(self):
+        """numpy.ndarray: Running integral of signal from cumulative_area()."""
+        return self._cached('cum_area', self.cumulative_area)
+
+    def _integrate_inds(self, left, right):
+        """Return areas from points left to right (inclusive) of cum_area."""
+        left = np.asarray(left, dtype=int)
+        right = np.maximum(np.asarray(right, dtype=int), left)
+        return self.cum_area[right] - self.cum_area[left]
+
     def integrate_peak(self):
         """
         Find the area under the peak using a trapezoidal method.
 
         Calculate for each peak identified using bounds from integration_inds.
         Integrates peak trapezoidal in units of seconds*signal intensity.
+        Areas are differences of :attr:`cum_area`, so all peaks are integrated
+        at once.
 
         Returns
         -------
         numpy.ndarray
             counts for all peaks, rounded to three decimal places using np.around()
         """
-        counts = np.zeros(self.numpeaks)
-        for i in range(0, self.numpeaks):
-            counts[i] = np.trapz(self.signal[self.lind[i]:self.rind[i]],
-                                 x=60 * self.time[self.lind[i]:self.rind[i]])
-            if counts[i] == 0:
-                counts[i] = 1
-        return np.around(counts,decimals=3)
+        # Integration covers points lind through rind - 1
+        counts = self._integrate_inds(self.lind, self.rind - 1)
+        counts[counts == 0] = 1
+        return np.around(counts, decimals=3)
+
+    def integrate_windows(self, start, end):
+        """
+        Find the area under the signal within fixed time windows.
+
+        Uses the same trapezoidal integral as integrate_peak, but with
+        user supplied bounds instead of detected peaks. For example, the
+        calibration windows calDF['start'] and calDF['end'] can be
+        integrated directly without running peak detection.
+
+        Parameters
+        ----------
+        start : float or array-like
+            start time of each window in minutes
+        end : float or array-like
+            end time of each window in minutes
+
+        Returns
+        -------
+        numpy.ndarray
+            counts within each window in units of seconds*signal intensity
+        """
+        # Include points with start <= time <= end
+        left = np.searchsorted(self.time, np.asarray(start, dtype=float),
+                               side='left')
+        right = np.searchsorted(self.time, np.asarray(end, dtype=float),
+                                side='right') - 1
+        left = np.minimum(left, self.time.size - 1)
+        return self._integrate_inds(left, right)
+
+    def get_peak_table(self):
+        """
+        Return peak locations and integrated counts as numpy arrays.
+
+        Returns
+        -------
+        dict
+            {'time': apex times (min), 'lind': left bounds, 'rind': right
+            bounds, 'counts': integrated counts} for every peak in apex_ind
+        """
+        return {'time': self.time[self.apex_ind], 'lind': self.lind,
+                'rind': self.rind, 'counts': self.counts}
 
     def get_concentrations(self, calDF):
         """
@@ -263,12 +439,13 @@ class GCData:
 
         Output has the same order as the calibration file chem IDs.
         Prints warning if zero molecules are detected or if peaks are found
-        outside of those listed in calDF.
+        outside of those listed in calDF. Uses get_concentration_row().
 
         Parameters
         ----------
-        calDF: pandas.DataFrame
-            Calibration values by chemical ID
+        calDF: pandas.DataFrame or GCCalibration
+            Calibration values by chemical ID. When analyzing many files,
+            pass a GCCalibration built once to avoid recompiling calDF.
 
         Returns
         -------
@@ -278,29 +455,45 @@ class GCData:
         -----
             Unknown peaks could be added to calibration dataframe for reference
         """
+        if not isinstance(calDF, GCCalibration):
+            calDF = GCCalibration(calDF)
+        conc = self.get_concentration_row(calDF)
+        return pd.Series(conc, index=['timestamp', *calDF.chem_ids.tolist()])
+
+    def get_concentration_row(self, calibration):
+        """
+        Return a numpy array of timestamp and chemical concentrations.
+
+        All peaks are matched to chemicals and converted to ppm at once using
+        the compiled calibration. If two peaks match the same chemical, the
+        later peak is used.
+
+        Parameters
+        ----------
+        calibration: GCCalibration
+            Compiled calibration values by chemical ID
+
+        Returns
+        -------
+        numpy.ndarray
+            [timestamp, ppm of chem 1, ..., ppm of chem N] in the order of
+            calibration.chem_ids
+        """
         # TODO Unknown peaks could be added
         # to calibration dataframe for reference
-        #self.integration_inds()
-        # Creates empty series where index are ChemIDs from Cal file
-        conc = pd.Series(0.0, index=['timestamp', *calDF.index.to_list()])
-        conc['timestamp'] = self.timestamp
-        counts = self.integrate_peak()
-        UnknownPeaks = 0
-        for i in range(len(self.apex_ind)):
-            # Determine peak time based on index
-            peak_time = self.time[self.apex_ind[i]]
-            # determine if peak falls within range for any calibration data set
-            match = calDF[(calDF["start"] < peak_time)
-                          & (peak_time < calDF["end"])].index
-            if not match.empty:  # if empty, there are no matches
-                chemID = match[0]  # if not empty, name match chemical:chemID
-                # Convert counts to ppm append to conc list for the ChemID
-                conc[chemID] = (self.convert_to_ppm(calDF, counts[i], chemID))
-            else:
-                UnknownPeaks += 1
-                # TODO I can take the ind_x and append this
-                # unknown peak to the calibration df
-
+        # Creates empty row, timestamp followed by ChemIDs from Cal file
+        conc = np.zeros(len(calibration.chem_ids) + 1)
+        conc[0] = self.timestamp
+        # Determine peak time based on index
+        peak_times = self.time[self.apex_ind]
+        # determine if peak falls within range for any calibration data set
+        chem_num = calibration.match(peak_times)
+        known = chem_num >= 0
+        # Convert counts to ppm, assign in peak order so last match is kept
+        conc[chem_num[known] + 1] = calibration.convert_to_ppm(
+            self.counts[known], chem_num[known])
+
+        UnknownPeaks = np.count_nonzero(~known)
         if UnknownPeaks > 1:  # Theres always a peak from back flush right now
             print('Warning: %5d Unknown peaks detected' % (UnknownPeaks))
             print(self.filepath)
@@ -391,3 +584,124 @@ class GCData:
         # Simple calibration equation. Needs update if calibration isn't linear
         y = m * counts + b
         return y  # Counts in ppm
+
+
+def read_asc_header(filepath):
+    """
+    Read acquisition timestamp, rate, and size of a GC file without its data.
+
+    Only the first 22 lines of the file are read, so this is much faster than
+    building a :class:`GCData` object when only the header info is needed
+    (e.g. ordering runs by time). Works for .ASC and .CHR files.
+
+    Parameters
+    ----------
+    filepath : str
+        full path to the GC data file
+
+    Returns
+    -------
+    tuple(float, int, int)
+        (timestamp, sampling rate (Hz), number of data points)
+        Timestamp is given in time since epoch.
+    """
+    with open(filepath, 'rb') as f:
+        header = GCData._read_header(f)
+    return header
+
+
+class GCCalibration:
+    """
+    GC calibration data compiled into arrays for matching peaks to chemicals.
+
+    Built once from a calibration DataFrame and reused for every data file in
+    an experiment. Retention time windows are stored as sorted edges so all
+    peaks of a chromatogram are assigned with a single np.searchsorted call.
+
+    Parameters
+    ----------
+    calDF : pandas.DataFrame
+        Formatted DataFrame containing gc calibration data.
+        Format [ChemID, slope, intercept, start, end]
+    """
+
+    def __init__(self, calDF):
+        """Compile calibration DataFrame into numpy arrays."""
+        self.chem_ids = calDF.index.to_numpy()
+        """numpy.ndarray: Chemical IDs in the order of calDF."""
+
+        self.hash = hashlib.sha1(calDF.to_csv().encode()).hexdigest()
+        """str: Hash of calDF contents, used to check if results are stale."""
+
+        self.slope = calDF['slope'].to_numpy(dtype=float)
+        """numpy.ndarray: Calibration slope for each chemical."""
+
+        self.intercept = calDF['intercept'].to_numpy(dtype=float)
+        """numpy.ndarray: Calibration intercept for each chemical."""
+
+        start = calDF['start'].to_numpy(dtype=float)
+        end = calDF['end'].to_numpy(dtype=float)
+
+        self.edges = np.unique(np.concatenate((start, end)))
+        """numpy.ndarray: Sorted unique start/end times of all windows."""
+
+        # Chemical number owning each edge point and each open interval
+        # between neighboring edges. -1 if no window contains it. Windows
+        # exclude their own start/end and the first chemical in calDF wins
+        # when windows overlap.
+        midpoints = (self.edges[:-1] + self.edges[1:]) / 2
+        self._edge_owner = self._first_window(self.edges, start, end)
+        self._interval_owner = self._first_window(midpoints, start, end)
+
+    @staticmethod
+    def _first_window(times, start, end):
+        """Return index of first window strictly containing each time."""
+        inside = (start < times[:, None]) & (times[:, None] < end)
+        return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+    def match(self, peak_times):
+        """
+        Find which chemical each peak time belongs to.
+
+        A peak matches a chemical when start < peak_time < end.
+
+        Parameters
+        ----------
+        peak_times : numpy.ndarray
+            Retention times (min) of peaks
+
+        Returns
+        -------
+        numpy.ndarray of int
+            Index into chem_ids for each peak, -1 for unknown peaks
+        """
+        peak_times = np.asarray(peak_times, dtype=float)
+        chem_num = np.full(peak_times.shape, -1, dtype=int)
+        if self.edges.size == 0:
+            return chem_num
+        ind = np.searchsorted(self.edges, peak_times, side='left')
+        safe_ind = np.minimum(ind, self.edges.size - 1)
+        on_edge = (ind < self.edges.size) & (self.edges[safe_ind] == peak_times)
+        between = ~on_edge & (ind > 0) & (ind < self.edges.size)
+        chem_num[on_edge] = self._edge_owner[ind[on_edge]]
+        chem_num[between] = self._interval_owner[ind[between] - 1]
+        return chem_num
+
+    def convert_to_ppm(self, counts, chem_num):
+        """
+        Convert integrated raw counts into ppm based on calibration data.
+
+        Parameters
+        ----------
+        counts : numpy.ndarray
+            Raw integrated counts determined by integrate_peaks()
+        chem_num : numpy.ndarray of int
+            Index into chem_ids of the chemical for each count
+
+        Returns
+        -------
+        numpy.ndarray
+            Counts converted into ppm based on calibration
+        """
+        # Simple calibration equation. Needs update if calibration isn't linear
+        return self.slope[chem_num] * counts + self.intercept[chem_num]
@@ -6,8 +6,16 @@ the current state, this class loads in a csv file of specific format
 representing the mean/max temperature of an ROI representing the catalysts.
 This is a developmental script and may change in future iterations of catalight
 """
+import os
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import scipy.ndimage as nd
+
+_IR_COLUMNS = ('abstime', 'surface temperature - max',
+               'surface temperature - mean')
+"""tuple[str]: Names of the columns loaded by IRData.import_data."""
 
 
 class IRData():
@@ -43,6 +51,13 @@ class IRData():
         :meth:`~IRData.remove_dropped_frames()`
         """
 
+        self.dropped_frame_stats = None
+        """
+        dict: Number of 'frames', 'nan', 'outliers', 'dropped', 'gaps', and
+        'missing_frames', and the median 'frame_interval' in seconds from
+        :meth:`~IRData.remove_dropped_frames()`
+        """
+
         self.avg_surface_temps = None
         """
         pandas.DataFrame: Avg surface temperatures for each experiment step.
@@ -57,66 +72,143 @@ class IRData():
         self.import_data(IR_data_path)
         self.remove_dropped_frames(column_name='surface temperature - mean')
 
-    def import_data(self, IR_data_path):
-        """Import IR cam data as a csv using :func:`~pandas.read_csv`.
+    def import_data(self, IR_data_path, chunksize=500000, use_cache=True):
+        """Import IR cam data from a csv file in chunks.
 
         data format should have ["abstime", "reltime", max temp, mean temp]
         The names of columns -1 and -2 are converted to
         'surface temperature - mean' and 'surface temperature - max',
-        respectively
+        respectively. Only abstime and these two columns are loaded.
+
+        The imported columns are cached as a .npz file next to the csv
+        (name_cache.npz) and are loaded from there on later imports unless
+        the csv has changed. If the cache can't be written, e.g. on a
+        read-only share, the data is imported without it.
 
         Parameters
         ----------
         IR_data_path : str
             Full path to IR cam data as a csv file
+        chunksize : `int`, optional
+            Number of rows read at once, by default 500000
+        use_cache : `bool`, optional
+            Load from and save to the .npz cache, by default True
         """
-        df = pd.read_csv(IR_data_path, header=0)
-        # Convert last column name to "surface temperature"
-        df.columns.values[-1] = 'surface temperature - mean'
-        df.columns.values[-2] = 'surface temperature - max'
-
-        # Convert string to datetime object
-        df['abstime'] = pd.to_datetime(df['abstime'],
-                                       format=self.date_format)
+        cache_path = os.path.splitext(IR_data_path)[0] + '_cache.npz'
+        stat = os.stat(IR_data_path)
+        source = np.array([stat.st_size, stat.st_mtime_ns])
+        if use_cache and os.path.isfile(cache_path):
+            with np.load(cache_path) as cache:
+                if np.array_equal(cache['source'], source):
+                    self.raw_data = pd.DataFrame(
+                        {name: cache[key] for key, name
+                         in zip(['abstime', 'max', 'mean'], _IR_COLUMNS)})
+                    return
+
+        df = pd.concat(self._read_chunks(IR_data_path, chunksize),
+                       ignore_index=True)
+        # Time windows are found by searching sorted abstime
+        if not df['abstime'].is_monotonic_increasing:
+            df = df.sort_values('abstime', kind='stable', ignore_index=True)
         self.raw_data = df
 
+        if use_cache:
+            # Write to temp file so an interrupted save can't corrupt cache
+            tmp_path = cache_path[:-len('.npz')] + '_tmp.npz'
+            try:
+                np.savez(tmp_path, source=source,
+                         abstime=df['abstime'].to_numpy(),
+                         max=df[_IR_COLUMNS[1]].to_numpy(),
+                         mean=df[_IR_COLUMNS[2]].to_numpy())
+                os.replace(tmp_path, cache_path)
+            except OSError as e:  # e.g. read-only data folder
+                print('Could not save IR data cache:', e)
+                if os.path.isfile(tmp_path):
+                    os.remove(tmp_path)
+
+    def _read_chunks(self, IR_data_path, chunksize):
+        """Yield DataFrames of typed columns in _IR_COLUMNS from csv."""
+        header = pd.read_csv(IR_data_path, nrows=0).columns
+        # Temperature columns are identified by position
+        names = {'abstime': _IR_COLUMNS[0],
+                 header[-2]: _IR_COLUMNS[1],
+                 header[-1]: _IR_COLUMNS[2]}
+        dtype = {'abstime': str, header[-2]: float, header[-1]: float}
+        reader = pd.read_csv(IR_data_path, usecols=list(names), dtype=dtype,
+                             chunksize=chunksize)
+        for chunk in reader:
+            chunk = chunk.rename(columns=names)[list(_IR_COLUMNS)]
+            # Convert string to datetime object
+            chunk['abstime'] = pd.to_datetime(chunk['abstime'],
+                                              format=self.date_format)
+            yield chunk
+
     def remove_dropped_frames(self, column_name='surface temperature - mean',
-                              window_size=50, threshold=10):
+                              window_size=50, threshold=10, gap_factor=2,
+                              chunksize=500000):
         """Attemps to remove odd frames that are sometimes captured.
 
-        Drop frames that fall "threshold" away from the mean using rolling
-        mean.
+        Drop frames that fall "threshold" percent away from the rolling median
+        of column_name, and frames with NaN values. Gaps in the frame times
+        longer than gap_factor times the median frame interval are counted as
+        missing frames. The rolling median is computed on arrays chunk by
+        chunk with half a window of context on each side, so the result does
+        not depend on chunksize. All of raw_data is kept in memory, chunking
+        only limits the size of the temporary arrays. Results are stored in
+        :attr:`~IRData.filtered_data` and :attr:`~IRData.dropped_frame_stats`.
 
         Parameters
         ----------
         column_name : `str`, optional
-            name of the column to use for computing the rolling mean and
+            name of the column to use for computing the rolling median and
             dropping frames, by default 'surface temperature - mean'
         window_size : `int`, optional
-            number of datapoint to use when computing rolling mean,
+            number of datapoint to use when computing rolling median,
             by default 50
         threshold : `int`, optional
-            Degrees K to count as a normal deviation from the rolling mean.
+            Percent deviation from the rolling median to count as normal.
             A variation larger than this is considered a "dropped" frame that
             was incorrectly measured by IR camera, by default 10
+        gap_factor : `float`, optional
+            Frame intervals longer than gap_factor times the median interval
+            are counted as gaps, by default 2
+        chunksize : `int`, optional
+            Number of frames filtered at once, by default 500000
         """
-        # Assuming df is your DataFrame with a column 'surface_temperature'
-        df = self.raw_data
-        # Calculate the rolling mean
-        df['rolling_mean'] = df[column_name].rolling(window=window_size, center=True).mean()
-        df['rolling_std'] = df[column_name].rolling(window=window_size, center=True).std()
-
-        # Calculate the difference between the original data and the rolling mean
-        df['diff'] = abs(df[column_name] - df['rolling_mean']) / df['rolling_mean'] * 100
-
-        # Remove rows where the difference is above the threshold
-        df_cleaned = df[df['diff'] <= threshold].copy()
-
-        # Drop the auxiliary columns used for calculation
-        df_cleaned = df_cleaned.drop(['rolling_mean', 'diff'], axis=1)
-
-        # Display the cleaned DataFrame
-        self.filtered_data = df_cleaned
+        values = self.raw_data[column_name].to_numpy(dtype=float)
+        abstime = self.raw_data['abstime'].to_numpy()
+        num_frames = len(values)
+        halo = window_size // 2  # Context needed on either side of chunk
+        keep = np.zeros(num_frames, dtype=bool)
+        stats = {'frames': num_frames, 'nan': 0, 'outliers': 0,
+                 'gaps': 0, 'missing_frames': 0, 'frame_interval': np.nan}
+        for start in range(0, num_frames, chunksize):
+            end = min(start + chunksize, num_frames)
+            lo, hi = max(start - halo, 0), min(end + halo, num_frames)
+            chunk_keep, _ = find_dropped_frames(values[lo:hi],
+                                                window_size, threshold)
+            keep[start:end] = chunk_keep[start - lo:end - lo]
+            # Count only this chunk's frames, not NaN in the halo
+            stats['nan'] += int(np.isnan(values[start:end]).sum())
+
+        # Frame interval gaps, duplicate timestamps don't set the interval
+        intervals = np.diff(abstime) / np.timedelta64(1, 's')
+        if (intervals > 0).any():
+            interval = float(np.median(intervals[intervals > 0]))
+            gaps = intervals[intervals > gap_factor * interval]
+            stats['frame_interval'] = interval
+            stats['gaps'] = len(gaps)
+            stats['missing_frames'] = int(
+                np.sum(np.round(gaps / interval) - 1))
+
+        stats['outliers'] = num_frames - stats['nan'] - int(np.sum(keep))
+        stats['dropped'] = num_frames - int(np.sum(keep))
+        self.dropped_frame_stats = stats
+        print('Dropped %i of %i frames (%i outliers, %i NaN), '
+              '%i gaps with ~%i missing frames'
+              % (stats['dropped'], num_frames, stats['outliers'],
+                 stats['nan'], stats['gaps'], stats['missing_frames']))
+        self.filtered_data = self.raw_data[keep].copy()
 
     def compute_avg_surface_temps(self, expts, measurement_range=20):
         """Computes the average surface temperatures during experiments.
@@ -144,34 +236,22 @@ class IRData():
             [minutes] Length of time to average temp on each expt step.
         """
 
-        surface_temps = []
         ramp_time = 0
         measurement_range = 60*measurement_range  # convert to seconds
 
+        windows = []  # [expt, t0, t1, t2] for every step of every expt
         for expt in expts:
             if expt.expt_type == "stability_test":
                 next  # skip stability test experiments
 
             T1 = 273  # Arbitrary start value
 
-            # # These definitions should come from experiment in the future
-            # # but the expt_log features need to be updated to save this data
-            # expt.sample_rate = 30
-            # expt.t_steady_state = 60
-            # expt.t_buffer = 5
-            # expt.sample_rate = 30  # Need to add to expt_log file
-            # expt.t_steady_state = 30
-            # expt.t_buffer = 5  # this shouldn't be right but seems like things are not going long enough
-
-
-            # Create new empty attr
-            expt.surface_temps = {'max': [], 'mean': []}
-
             step_length = (expt.t_steady_state
                             + expt.sample_rate*(expt.sample_set_size-1)
                             + expt.t_buffer)
 
             ramp_time = 0  # Reset value
+            step_times = expt.step_times
             for plateau_ID, step_value in enumerate(getattr(expt, expt.ind_var)):
                 # Determine the temperature setpoint to calculate ramp up time
                 if expt.expt_type == "temp_sweep":
@@ -182,43 +262,90 @@ class IRData():
                 T1 = T2  # Update for the next calculation
 
                 # Calculate time range for averaging
-                t1 = (expt.start_time + ramp_time
-                      + 60*(expt.t_steady_state + plateau_ID*step_length))
+                if (len(step_times) > plateau_ID
+                        and 'gc_start' in step_times[plateau_ID]):
+                    # Use logged time GC collection actually started
+                    t1 = step_times[plateau_ID]['gc_start']
+                else:  # Older expt_log or run stopped before collection
+                    t1 = (expt.start_time + ramp_time
+                          + 60*(expt.t_steady_state + plateau_ID*step_length))
                 t2 = t1 + measurement_range
                 # t2 = t1 + expt_length*60
+                windows.append([expt, expt.start_time, t1, t2])
 
-                # Convert t1 and t2 to datetime objects
-                t0_datetime = pd.to_datetime(expt.start_time, unit='s')
-                t1_datetime = pd.to_datetime(t1, unit='s')
-                t2_datetime = pd.to_datetime(t2, unit='s')
-
-                # Filter rows between t1 and t2
-                filtered_data = self.raw_data[
-                    (self.raw_data['abstime'] >= t1_datetime)
-                    & (self.raw_data['abstime'] <= t2_datetime)]
+        # Convert times to datetime objects
+        t0_datetime, t1_datetime, t2_datetime = [
+            pd.to_datetime([window[n] for window in windows], unit='s')
+            for n in range(1, 4)]
 
-                # Compute time averaged surface temperature
-                mean_temp = filtered_data['surface temperature - mean'].mean()+273
-                max_temp = filtered_data['surface temperature - max'].mean()+273
+        # Compute time averaged surface temperature of every window at once
+        means = self.window_means(t1_datetime, t2_datetime,
+                                  ['surface temperature - mean',
+                                   'surface temperature - max']) + 273
 
-                # Add avg surface temp to experiment object
-                expt.surface_temps['mean'].append(mean_temp)
-                expt.surface_temps['max'].append(max_temp)
-
-                # Compile time averaged surface temps into a list
-                surface_temps.extend([[t0_datetime,
-                                       t1_datetime, t2_datetime,
-                                       mean_temp, max_temp]])
+        # Add avg surface temp to experiment objects
+        for expt in expts:
+            expt.surface_temps = {'max': [], 'mean': []}  # Create new attr
+        for (expt, *_), (mean_temp, max_temp) in zip(windows, means):
+            expt.surface_temps['mean'].append(mean_temp)
+            expt.surface_temps['max'].append(max_temp)
 
+        for expt in expts:
             print('for experiment: ', expt.expt_name)
             print("Global Temperature = ", expt.temp)
             for key, value in expt.surface_temps.items():
                 print(key, ':', value)
             print("Independent Variable = ", expt.ind_var)
+
         # save compiled time averaged surface temps as object attr
-        self.avg_surface_temps = pd.DataFrame(surface_temps,
-                                              columns=['t0', 't1', 't2',
-                                                       'mean', 'max'])
+        self.avg_surface_temps = pd.DataFrame({'t0': t0_datetime,
+                                               't1': t1_datetime,
+                                               't2': t2_datetime,
+                                               'mean': means[:, 0],
+                                               'max': means[:, 1]})
+
+    def window_means(self, t1, t2, columns):
+        """Average columns of :attr:`~IRData.raw_data` over time windows.
+
+        Window edges are found with :func:`~numpy.searchsorted` on the sorted
+        abstime column and all means come from one cumulative sum of each
+        column, so the cost is linear in data length plus number of windows.
+        Both edges are included. NaN values are ignored and empty windows
+        give NaN.
+
+        Parameters
+        ----------
+        t1 : array-like of datetime64
+            Start time of each window.
+        t2 : array-like of datetime64
+            End time of each window.
+        columns : list[str]
+            Names of the columns to average.
+
+        Returns
+        -------
+        numpy.ndarray
+            [window x column] mean values.
+        """
+        abstime = self.raw_data['abstime'].to_numpy()
+        left = np.searchsorted(abstime, np.asarray(t1, dtype=abstime.dtype),
+                               side='left')
+        right = np.searchsorted(abstime, np.asarray(t2, dtype=abstime.dtype),
+                                side='right')
+
+        values = self.raw_data[columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        # Leading zero row so sum of rows [i, j) = cum[j] - cum[i]
+        zeros = np.zeros((1, len(columns)))
+        cum_sum = np.concatenate((zeros, np.cumsum(np.where(valid, values, 0),
+                                                   axis=0)))
+        cum_count = np.concatenate((zeros, np.cumsum(valid, axis=0)))
+
+        total = cum_sum[right] - cum_sum[left]
+        count = cum_count[right] - cum_count[left]
+        means = np.full(total.shape, np.nan)
+        np.divide(total, count, out=means, where=count > 0)
+        return means
 
     def rezero_time_axis(self, t0):
         """Adds new relative time to surface temp data sets starting a t0.
@@ -333,3 +460,38 @@ class IRData():
         ax.set_xlabel("Time [min]")
         ax.set_ylabel("Surface Temperature [°C]")
         return fig, ax
+
+
+def find_dropped_frames(values, window_size=50, threshold=10):
+    """Find frames that deviate from the rolling median of their neighbors.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        1D array of values for consecutive frames.
+    window_size : `int`, optional
+        Number of frames used for the centered rolling median, by default 50
+    threshold : `float`, optional
+        Percent deviation from the rolling median to count as normal,
+        by default 10
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, True for frames to keep.
+    int
+        Number of NaN frames (never kept).
+    """
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return valid, len(values)
+    # Fill NaN with previous valid value so they don't spread in the median
+    ind = np.where(valid, np.arange(len(values)), 0)
+    ind = np.maximum.accumulate(ind)
+    ind[:np.argmax(valid)] = np.argmax(valid)  # Leading NaN use first value
+    filled = values[ind]
+
+    rolling_median = nd.median_filter(filled, size=window_size,
+                                      mode='nearest')
+    diff = np.abs(filled - rolling_median) / rolling_median * 100
+    return valid & (diff <= threshold), int(np.sum(~valid))
@@ -0,0 +1,192 @@
+"""
+Background analysis of GC data while an experiment is running.
+
+The :class:`LiveAnalyzer` polls the step folders an
+:class:`~catalight.equipment.experiment_control.Experiment` is writing GC data
+into and analyzes each FID file once it is finished. New runs are appended to
+run_results.csv and avg_conc.csv/std_conc.csv are recomputed from that table,
+so results are always current. Usually started by passing calDF to
+:meth:`~catalight.equipment.experiment_control.Experiment.run_experiment`.
+"""
+import os
+import threading
+
+import pandas as pd
+
+from catalight.analysis.gcdata import GCCalibration
+from catalight.analysis.tools import (scan_data_dirs, run_analysis,
+                                      file_stat, analyze_files,
+                                      sort_by_timestamp, load_run_results,
+                                      summarize_run_results,
+                                      load_analysis_cache,
+                                      save_analysis_cache)
+
+
+class LiveAnalyzer():
+    """
+    Analyze GC data files as they are collected during an experiment.
+
+    A file is analyzed once its size and modification time are unchanged
+    between two polls, so files PeakSimple is still writing are skipped until
+    the next poll. Only new files are processed, runs are numbered in order of
+    their timestamps within each step. If an analyzed file changes or is
+    removed, the experiment is reanalyzed with
+    :func:`~catalight.analysis.tools.run_analysis`. Per-file results are saved
+    with :func:`~catalight.analysis.tools.save_analysis_cache` when stopped,
+    so calling run_analysis with use_cache=True after the experiment costs
+    almost nothing.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment being run. data_path and results_path should already exist.
+    calDF : pandas.DataFrame
+        Formatted DataFrame containing gc calibration data.
+        Format [ChemID, slope, intercept, start, end]
+    interval : `float`, optional
+        Time between checks for new files in seconds. The default is 10.
+    """
+
+    def __init__(self, expt, calDF, interval=10):
+        self.expt = expt
+        """Experiment whose data folders are watched"""
+        self.calDF = calDF
+        """Calibration used to convert counts to ppm"""
+        self.interval = interval
+        """Time between checks for new files in seconds"""
+        self.results = None
+        """Latest (run results, avg, std) or None, see load_run_results"""
+        self._calibration = GCCalibration(calDF)
+        self._cache = {}  # Per-file results, see analyze_files
+        self._step_paths = []
+        self._last_stats = {}  # File stats seen on the previous poll
+        self._analyzed = {}  # File stats included in results
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def watch(self, step_path):
+        """
+        Add a step folder to the folders checked for new GC data.
+
+        Folders stay watched after a new one is added so runs that finish
+        writing late are still picked up.
+
+        Parameters
+        ----------
+        step_path : str
+            Full path of the folder GC data is being saved to.
+        """
+        with self._lock:
+            if step_path not in self._step_paths:
+                self._step_paths.append(step_path)
+
+    def start(self):
+        """Start checking for new files on a background thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, analyze remaining files, save cache."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.update(wait_for_writes=False)
+        with self._lock:
+            if self._cache:
+                save_analysis_cache(self.expt, self._cache, self._calibration)
+
+    def update(self, wait_for_writes=True):
+        """
+        Analyze finished data files added or changed since the last update.
+
+        Parameters
+        ----------
+        wait_for_writes : `bool`, optional
+            Only analyze once every file is unchanged since the previous call.
+            Use False when the GC is known to be finished. The default is True.
+
+        Returns
+        -------
+        bool
+            True if the results were updated.
+        """
+        with self._lock:
+            data_dirs = scan_data_dirs(self._step_paths, channels=('FID',),
+                                       suffixes=('.asc',))
+            step_files = {step_path: files[('FID', '.asc')]
+                          for step_path, files in data_dirs.items()}
+            stats = {filepath: file_stat(filepath)
+                     for files in step_files.values() for filepath in files}
+            writing = stats != self._last_stats
+            self._last_stats = stats
+            if stats == self._analyzed or (wait_for_writes and writing):
+                return False
+            changed = any(stats.get(filepath) != stat
+                          for filepath, stat in self._analyzed.items())
+            try:
+                if changed:
+                    self._reanalyze()
+                else:
+                    self._append(step_files)
+            except Exception as e:
+                # Don't stop experiment over bad file, try again next poll
+                print('Live analysis failed:', e)
+                return False
+            self._analyzed = stats
+            return True
+
+    def _append(self, step_files):
+        """Analyze new files, append runs to run_results.csv, update avg."""
+        results = None if self.results is None else self.results[0]
+        rows = []
+        for step_path, files in step_files.items():
+            new_files = [filepath for filepath in files
+                         if filepath not in self._analyzed]
+            if not new_files:
+                continue
+            step_num, _, condition = os.path.basename(step_path).partition(' ')
+            step_num = int(step_num)
+            # Number runs in the order they were collected
+            new_files, _ = sort_by_timestamp(new_files)
+            num_runs = 0 if results is None else int(
+                (results['step'] == step_num).sum())
+            all_conc = analyze_files(new_files, self._calibration,
+                                     cache=self._cache)
+            for run_num, conc in enumerate(all_conc, start=num_runs + 1):
+                rows.append([step_num, condition, run_num, *conc])
+
+        # Same columns as run_results.csv from run_analysis
+        new_rows = pd.DataFrame(rows, columns=['step', 'condition', 'run',
+                                               'timestamp',
+                                               *self.calDF.index])
+        os.makedirs(self.expt.results_path, exist_ok=True)
+        path = os.path.join(self.expt.results_path, 'run_results.csv')
+        if results is None:  # Replace results of any earlier analysis
+            new_rows.to_csv(path, index=False)
+            results = new_rows
+        else:
+            new_rows.to_csv(path, mode='a', header=False, index=False)
+            results = pd.concat([results, new_rows], ignore_index=True)
+        self._save_summary(results)
+
+    def _reanalyze(self):
+        """Rerun the full analysis, used when analyzed files changed."""
+        save_analysis_cache(self.expt, self._cache, self._calibration)
+        run_analysis(self.expt, self.calDF, use_cache=True)
+        self._cache = load_analysis_cache(self.expt, self._calibration)
+        self._save_summary(load_run_results(self.expt))
+
+    def _save_summary(self, results):
+        """Recompute avg and std from run results and save them."""
+        avg, std = summarize_run_results(self.expt, results)
+        avg.to_csv(os.path.join(self.expt.results_path, 'avg_conc.csv'))
+        std.to_csv(os.path.join(self.expt.results_path, 'std_conc.csv'))
+        self.results = (results, avg, std)
+
+    def _run(self):
+        """Poll for new files until stop is called."""
+        while not self._stop_event.wait(self.interval):
+            self.update()
@@ -155,19 +155,16 @@ def plot_run_num(expt, calDF, switch_to_hours=2):
     """
     # Initialize run num plot
     fig, ax = plt.subplots()
-    concentrations, avg, std = analysis_tools.load_results(expt)
-    # Calculations:
     calchemIDs = calDF.index  # get chem IDs from calibration files
-    time_passed, time_unit = analysis_tools.get_timepassed(concentrations,
+    results = analysis_tools.load_run_results(expt, columns=calchemIDs)
+    # Calculations:
+    time_passed, time_unit = analysis_tools.get_timepassed(results,
                                                            switch_to_hours,
                                                            expt)
 
-    # use regex to determine number of carbons (or other) in molecule name
     for chemical in calchemIDs:
-        chem_num = calchemIDs.get_loc(chemical) + 1  # index 0 is timestamp
         # Concentrations for individual chemical
-        ind_concentrations = concentrations[:, chem_num, :]
-        ind_concentrations = ind_concentrations[~np.isnan(ind_concentrations)]
+        ind_concentrations = results[chemical].to_numpy()
         if sum(ind_concentrations) == 0:
             continue  # Skip chemicals with no values
         ax.plot(time_passed, ind_concentrations, 'o', label=chemical)
@@ -211,7 +208,7 @@ def plot_ppm(expt, calDF, mole_bal='c', switch_to_hours=2):
     """
     # Initialize ppm vs ind_var plot
     fig, ax = plt.subplots()
-    concentrations, avg, std = analysis_tools.load_results(expt)
+    avg, std = analysis_tools.load_avg_std(expt)
     calchemIDs = calDF.index  # get chem IDs from calibration files
 
     units = (expt.expt_list['Units']
@@ -293,7 +290,7 @@ def plot_X_and_S(expt, reactant, target_molecule):
     # Initialize Conv and Selectivity plot
     fig, ax = plt.subplots()
     results = analysis_tools.calculate_X_and_S(expt, reactant, target_molecule)
-    concentrations, avg, std = analysis_tools.load_results(expt)
+    avg, std = analysis_tools.load_avg_std(expt)
     # units = (expt.expt_list['Units']
     #          [expt.expt_list['Active Status']].to_string(index=False))
     X = results['Conversion']
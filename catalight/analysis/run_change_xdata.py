@@ -77,7 +77,10 @@ def get_user_inputs(starting_dir=None, cal_folder=None):
     data_dialog = DataExtractor(starting_dir)
     if data_dialog.exec_() == DataExtractor.Accepted:
         file_list, data_labels = data_dialog.get_output()
-        file_list = analysis.tools.list_matching_files(file_list, 'expt_log', '.txt')
+        # Selected paths are experiment folders, no need to search them
+        file_list = [os.path.join(expt_dir, 'expt_log.txt')
+                     for expt_dir in file_list
+                     if os.path.isfile(os.path.join(expt_dir, 'expt_log.txt'))]
 
     # Edit Options specifically for initial analysis dialog
     include_dict = {'xdata': True, 'units': True, 'reactant': True,
@@ -141,7 +144,7 @@ def main(expt_paths, calDF, xdata, units, reactant, target_molecule,
     new_x = parse_input(xdata)
     for expt in expts:
         # Must have previously analyzed data
-        (results, avg, std) = analysis.tools.load_results(expt)
+        (avg, std) = analysis.tools.load_avg_std(expt)
         # Redefine x axis and update units
         expt.expt_list['Units'][2] = units
         avg.index = pd.Index(new_x, name=units)
@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from PyQt5.QtWidgets import QFileDialog, QApplication, QDialog
 import catalight.analysis as analysis
+from catalight.analysis.catalog import list_expt_logs
 from catalight.analysis.user_inputs import (DirectorySelector,
                                             PlotOptionsDialog,
                                             PlotOptionList)
@@ -68,7 +69,8 @@ def get_user_inputs(starting_dir=None, cal_folder=None):
 
 def main(main_dirs, calDF, reactant, target_molecule, mole_bal='c',
          figsize=(6.5, 4.5), savedata=False, switch_to_hours=2,
-         overwrite=False, basecorrect=True):
+         overwrite=False, basecorrect=True, workers=None, use_cache=False,
+         use_catalog=True):
     """
     Run initial analysis.
 
@@ -113,6 +115,18 @@ def main(main_dirs, calDF, reactant, target_molecule, mole_bal='c',
         files. False will only plot these. The default is False.
     basecorrect : `bool`, optional
         True will perform baseline correction on GC data. The default is True.
+    workers : `int`, optional
+        Number of processes used to analyze GC files in parallel.
+        The default is None (serial).
+    use_cache : `bool`, optional
+        Only reanalyze GC files that changed since the last analysis with the
+        same calibration. The default is False.
+    use_catalog : `bool`, optional
+        Find experiments using an
+        :class:`~catalight.analysis.catalog.ExperimentCatalog` saved in each
+        main directory instead of searching every folder, see
+        :func:`~catalight.analysis.catalog.list_expt_logs`. The default is
+        True.
 
     Returns
     -------
@@ -122,8 +136,11 @@ def main(main_dirs, calDF, reactant, target_molecule, mole_bal='c',
     plt.ioff()  # suppress plot windows
     options = (reactant, target_molecule, mole_bal,
                figsize, savedata, switch_to_hours)
-    filepaths = analysis.tools.list_matching_files(main_dirs,
-                                                   'expt_log', '.txt')
+    if use_catalog:
+        filepaths = list_expt_logs(main_dirs)
+    else:
+        filepaths = analysis.tools.list_matching_files(main_dirs,
+                                                       'expt_log', '.txt')
     expts = analysis.tools.list_expt_obj(filepaths)
     print(expts)
     for expt in expts:
@@ -131,7 +148,9 @@ def main(main_dirs, calDF, reactant, target_molecule, mole_bal='c',
                                                       'avg_conc', '.csv')
         if not has_data or overwrite:  # skip if has data and overwrite=False
             calculations = analysis.tools.run_analysis(expt, calDF,
-                                                       basecorrect, savedata)
+                                                       basecorrect, savedata,
+                                                       workers=workers,
+                                                       use_cache=use_cache)
             (concentrations, avg, std) = calculations
 
         (ax1, ax2, ax3) = analysis.plotting.plot_expt_summary(expt, calDF,
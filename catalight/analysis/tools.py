@@ -10,17 +10,18 @@ Created on Mon Feb  6 11:46:49 2023.
 import os
 import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
 from math import sqrt
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-from catalight.analysis.gcdata import GCData
+from catalight.analysis.gcdata import GCData, GCCalibration, read_asc_header
 from catalight.equipment.experiment_control import Experiment
 
 
-def list_matching_files(main_dirs, target, suffix):
+def list_matching_files(main_dirs, target, suffix, prefer=None):
     """
     Return files containing 'target' and ending in 'suffix' within a folder.
 
@@ -37,6 +38,10 @@ def list_matching_files(main_dirs, target, suffix):
         String of target phrase for finding files.
     suffix : str
         String target for the file type to search for.
+    prefer : `str`, optional
+        Alternate suffix to return instead when a file with the same name and
+        this suffix exists in the same folder (e.g. '.chr' to use binary GC
+        files in place of '.asc' exports). The default is None.
 
     Returns
     -------
@@ -48,15 +53,174 @@ def list_matching_files(main_dirs, target, suffix):
     filepath_list = []
     for root in main_dirs:
         for dirpath, dirnames, filenames in os.walk(root):
+            # Map lowercase names to real names to check for preferred files
+            lower_names = {name.lower(): name for name in filenames}
             for filename in filenames:
                 if (filename.lower().endswith(suffix.lower())
                         & (target.lower() in filename.lower())):
+                    if prefer is not None:
+                        alt_name = (filename[:-len(suffix)] + prefer).lower()
+                        filename = lower_names.get(alt_name, filename)
                     filepath = os.path.join(dirpath, filename)
                     filepath_list.append(filepath)
     sorted(filepath_list)
     return filepath_list
 
 
+PRUNED_DIRS = ('results', 'figures', 'images')
+"""tuple[str]: Folder names (lowercase) skipped by :func:`scan_data_dirs`."""
+
+
+def scan_data_dirs(main_dirs, channels=('FID', 'TCD'),
+                   suffixes=('.asc', '.chr'), prune=PRUNED_DIRS):
+    """
+    Find GC data files sorted by folder, channel, and file type in one pass.
+
+    Crawls every directory below main_dirs with :func:`os.scandir`, skipping
+    folders named in prune. Files are classified by the channel in their name
+    and their suffix (case insensitive). Directories are included if they
+    contain matching files or have no subdirectories (e.g. empty step folders
+    of an experiment still running).
+
+    Parameters
+    ----------
+    main_dirs : list[str]
+        List of string paths to main directories to crawl for data.
+        Can be a str to search a single directory.
+    channels : `tuple[str]`, optional
+        Detector names to search file names for.
+        The default is ('FID', 'TCD').
+    suffixes : `tuple[str]`, optional
+        File types to search for. The default is ('.asc', '.chr').
+    prune : `tuple[str]`, optional
+        Lowercase folder names not to search in.
+        The default is ('results', 'figures', 'images').
+
+    Returns
+    -------
+    dict
+        {dirpath: {(channel, suffix): [filepath, ...]}} ordered by dirpath.
+        Every (channel, suffix) combination is present, and file lists are
+        sorted by name. suffix is given in lowercase as provided.
+    """
+    if isinstance(main_dirs, str):
+        main_dirs = [main_dirs]
+    channels = [(channel, channel.lower()) for channel in channels]
+    suffixes = [suffix.lower() for suffix in suffixes]
+    data_dirs = {}
+    stack = list(main_dirs)
+    while stack:
+        dirpath = stack.pop()
+        files = {(channel, suffix): [] for channel, _ in channels
+                 for suffix in suffixes}
+        has_subdirs = False
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                if entry.is_dir():
+                    has_subdirs = True
+                    if name not in prune:
+                        stack.append(entry.path)
+                    continue
+                for suffix in suffixes:
+                    if name.endswith(suffix):
+                        for channel, lower in channels:
+                            if lower in name:
+                                files[(channel, suffix)].append(entry.path)
+                        break
+        if any(files.values()) or not has_subdirs:
+            for filepaths in files.values():
+                filepaths.sort()
+            data_dirs[dirpath] = files
+    return dict(sorted(data_dirs.items()))
+
+
+def select_data_files(files, channel='FID', suffix='.asc', prefer=None):
+    """
+    Pick the data files of one channel from a :func:`scan_data_dirs` folder.
+
+    Parameters
+    ----------
+    files : dict
+        {(channel, suffix): [filepath, ...]} for one folder.
+    channel : `str`, optional
+        Detector to return files for. The default is 'FID'.
+    suffix : `str`, optional
+        File type to return. The default is '.asc'.
+    prefer : `str`, optional
+        Alternate suffix to return instead when a file with the same name and
+        this suffix exists in the same folder. Must have been scanned for.
+        The default is None.
+
+    Returns
+    -------
+    list[str]
+        Full file paths sorted by name.
+    """
+    filepaths = files[(channel, suffix)]
+    if prefer is None:
+        return filepaths
+    alternates = {os.path.splitext(filepath)[0].lower(): filepath
+                  for filepath in files[(channel, prefer)]}
+    return [alternates.get(os.path.splitext(filepath)[0].lower(), filepath)
+            for filepath in filepaths]
+
+
+def scan_step_dirs(data_path, suffixes=('.asc',)):
+    """
+    Find the step folders of an experiment and their FID data files.
+
+    Step folders are the folders found by :func:`scan_data_dirs` directly
+    inside data_path. Used by :func:`run_analysis`, so other counts of an
+    experiment's data files should use this to match what is analyzed.
+
+    Parameters
+    ----------
+    data_path : str
+        Data folder of the experiment (expt.data_path).
+    suffixes : `tuple[str]`, optional
+        File types to search for. The default is ('.asc',).
+
+    Returns
+    -------
+    dict
+        {step_path: {('FID', suffix): [filepath, ...]}} ordered by step_path,
+        see :func:`scan_data_dirs`.
+    """
+    # Normalize so trailing separators or mixed slashes still match steps
+    data_key = os.path.normcase(os.path.normpath(data_path))
+    data_dirs = scan_data_dirs(data_path, channels=('FID',),
+                               suffixes=suffixes)
+    return {dirpath: files for dirpath, files in data_dirs.items()
+            if os.path.normcase(os.path.dirname(
+                os.path.normpath(dirpath))) == data_key}
+
+
+def sort_by_timestamp(file_list):
+    """
+    Sort GC data files by the acquisition time stored in their headers.
+
+    Uses :func:`~catalight.analysis.gcdata.read_asc_header` so only the file
+    headers are read, not the full chromatograms.
+
+    Parameters
+    ----------
+    file_list : list[str]
+        List of full paths to GC data files (.ASC or .CHR).
+
+    Returns
+    -------
+    list[str]
+        file_list sorted chronologically.
+    numpy.ndarray
+        Acquisition timestamps (time since epoch) of the sorted files.
+    """
+    timestamps = np.array([read_asc_header(filepath)[0]
+                           for filepath in file_list])
+    order = np.argsort(timestamps, kind='stable')
+    return [file_list[n] for n in order], timestamps[order]
+
+
 def list_expt_obj(file_paths):
     """
     Get list of experiments.
@@ -183,6 +347,11 @@ def load_results(expt):
     """
     Load analysis results of previously analyzed experiment.
 
+    Per-run concentrations are saved as run_results.csv rather than
+    concentrations.npy, the 3D matrix is rebuilt from that table. Use
+    :func:`load_run_results` to get the table itself, or :func:`load_avg_std`
+    when the per-run results aren't needed.
+
     Parameters
     ----------
     expt : Experiment
@@ -200,10 +369,231 @@ def load_results(expt):
         one standard deviation of concentration measurements
     """
     fol = expt.results_path
+    avg, std = load_avg_std(expt)
+    if not os.path.isfile(os.path.join(fol, 'run_results.csv')):
+        # Older analysis
+        concentrations = np.load(os.path.join(fol, 'concentrations.npy'))
+        return (concentrations, avg, std)
+    results = load_run_results(expt, columns=avg.columns)
+    concentrations = _table_to_concentrations(results, avg.columns, len(avg))
+    return (concentrations, avg, std)
+
+
+def load_avg_std(expt):
+    """
+    Load average and standard deviation of previously analyzed experiment.
+
+    Unlike :func:`load_results`, the per-run results are not read.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment object that has data and has been analyzed.
+
+    Returns
+    -------
+    pandas.DataFrame:
+        average concentration for each molecule and experiment condition
+    pandas.DataFrame:
+        one standard deviation of concentration measurements
+    """
+    fol = expt.results_path
     avg = pd.read_csv(os.path.join(fol, 'avg_conc.csv'), index_col=(0))
     std = pd.read_csv(os.path.join(fol, 'std_conc.csv'), index_col=(0))
-    concentrations = np.load(os.path.join(fol, 'concentrations.npy'))
-    return (concentrations, avg, std)
+    return (avg, std)
+
+
+def load_run_results(expt, columns=None, conditions=None):
+    """
+    Load per-run concentrations saved by :func:`run_analysis`.
+
+    Data analyzed before run_results.csv was introduced is converted from
+    concentrations.npy, using the step folder names as condition labels.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment object that has data and has been analyzed.
+    columns : list[str], optional
+        Chem IDs to load. step, condition, run, and timestamp are always
+        loaded. The default is None (all).
+    conditions : list[str], optional
+        Only load runs with these condition labels (step folder name without
+        the step number e.g. '300K'). The default is None (all).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per GC data file with columns
+        [step, condition, run, timestamp, ChemID...]
+        Rows are ordered by step then run number.
+    """
+    fol = expt.results_path
+    path = os.path.join(fol, 'run_results.csv')
+    if not os.path.isfile(path):  # Older analysis
+        concentrations = np.load(os.path.join(fol, 'concentrations.npy'))
+        avg = pd.read_csv(os.path.join(fol, 'avg_conc.csv'), index_col=(0))
+        results = _concentrations_to_table(concentrations, avg.columns,
+                                           _step_labels(expt.data_path))
+        if columns is not None:
+            results = results[_RUN_KEYS + list(columns)]
+        if conditions is not None:
+            results = results[results['condition'].isin(conditions)]
+        return results.reset_index(drop=True)
+
+    usecols = None if columns is None else _RUN_KEYS + list(columns)
+    dtype = {'condition': str}
+    if conditions is None:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype,
+                           float_precision='round_trip')
+    # Filter in chunks so only requested runs are held in memory
+    chunks = pd.read_csv(path, usecols=usecols, dtype=dtype,
+                         float_precision='round_trip', chunksize=10000)
+    return pd.concat([chunk[chunk['condition'].isin(conditions)]
+                      for chunk in chunks], ignore_index=True)
+
+
+_RUN_KEYS = ['step', 'condition', 'run', 'timestamp']
+"""list[str]: Columns of run_results.csv that describe each run."""
+
+
+def _build_run_table(step_files, all_conc, condition, calchemIDs):
+    """Build per-run results table from the files analyzed in run_analysis."""
+    rows = []
+    n = 0
+    for step_num, data_list in step_files:
+        for run_num in range(len(data_list)):
+            rows.append((step_num + 1, condition[step_num], run_num + 1))
+            n += 1
+    keys = pd.DataFrame(rows, columns=_RUN_KEYS[:3])
+    values = pd.DataFrame(np.reshape(all_conc, (n, len(calchemIDs) + 1)),
+                          columns=['timestamp', *calchemIDs])
+    results = pd.concat([keys, values], axis=1)
+    # Put runs in step order, step folders are found in arbitrary order
+    results = results.sort_values('step', kind='stable')
+    return results.reset_index(drop=True)
+
+
+def summarize_run_results(expt, results, condition=None):
+    """
+    Compute average and standard deviation of each condition from run table.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment object the results belong to.
+    results : pandas.DataFrame
+        Per-run concentrations with columns
+        [step, condition, run, timestamp, ChemID...],
+        see :func:`load_run_results`.
+    condition : `list[str]`, optional
+        Condition label of each step, index 0 is step 1. Steps without runs
+        are given NaN rows. The default is None, which uses the step folder
+        names in expt.data_path.
+
+    Returns
+    -------
+    pandas.DataFrame
+        average concentration for each molecule and experiment condition
+    pandas.DataFrame
+        one standard deviation of concentration measurements
+    """
+    calchemIDs = results.columns[len(_RUN_KEYS):]
+    if condition is None:
+        labels = _step_labels(expt.data_path)
+        condition = [labels.get(step_num, '') for step_num
+                     in range(1, max(labels, default=0) + 1)]
+    condition = np.asarray(condition, dtype=object)
+
+    # Pull out "Active" Units from expt_list DF
+    units = (expt.expt_list['Units']
+             [expt.expt_list['Active Status']].to_string(index=False))
+
+    if expt.expt_type == 'stability_test':
+        # Reset "condition" to be time passed for stability tests
+        # TODO This could check unit if expt_list updates
+        # to have time instead of temp in future.
+        runs = results[results['step'] == 1]
+
+        # Don't switch unit, get time passed in minutes.
+        time_passed, _ = get_timepassed(runs, switch_to_hours=1e9, expt=expt)
+        # Make sure time is chronological
+        order = np.argsort(time_passed)
+        condition = time_passed[order]  # Rewrite condition as time passed
+
+        idx_name = 'time [min]'  # We can get rid of this and else if TODO done
+        avg_dat = runs[calchemIDs].to_numpy(dtype=float)[order]
+        # TODO add err_concentration values to std
+        std_dat = avg_dat * 0
+
+    else:
+        idx_name = (expt.ind_var + ' [' + units + ']')  # Sweep Parameter
+        values = results[calchemIDs].to_numpy(dtype=float)
+        steps = results['step'].to_numpy()
+        avg_dat = np.full((len(condition), len(calchemIDs)), np.nan)
+        std_dat = np.full((len(condition), len(calchemIDs)), np.nan)
+        for step_num in np.unique(steps):
+            step_values = values[steps == step_num]
+            avg_dat[step_num - 1] = np.nanmean(step_values, axis=0)
+            # TODO add err_concentration values to std
+            std_dat[step_num - 1] = np.nanstd(step_values, axis=0)
+
+    # Redefine condition list as pandas index so we can assign a name
+    condition = pd.Index(condition, name=idx_name)
+
+    if units == 'frac':  # Change label style to stacked compositions.
+        condition = condition.str.replace('_', '\n')
+        condition = condition.str.replace('frac', '')
+
+    elif expt.expt_type == 'stability_test':
+        pass  # Already Float
+
+    else:  # Convert folder name to float w/o units.
+        condition = condition.str.replace(r'\D', '', regex=True).astype(float)
+
+    avg = pd.DataFrame(avg_dat, columns=calchemIDs, index=condition)
+    # TODO add err_concentration values to std
+    std = pd.DataFrame(std_dat, columns=calchemIDs, index=condition)
+    return (avg, std)
+
+
+def _step_labels(data_path):
+    """Return {step number: condition label} from step folder names."""
+    labels = {}
+    if os.path.isdir(data_path):
+        for name in os.listdir(data_path):
+            step_num, _, step_val = name.partition(' ')
+            if step_num.isdigit():
+                labels[int(step_num)] = step_val
+    return labels
+
+
+def _concentrations_to_table(concentrations, calchemIDs, labels):
+    """Convert 3D concentrations array of older analysis to run table."""
+    num_fols, num_cols, max_runs = concentrations.shape
+    step, run = np.meshgrid(np.arange(1, num_fols + 1),
+                            np.arange(1, max_runs + 1), indexing='ij')
+    step = step.reshape(-1)
+    values = concentrations.transpose(0, 2, 1).reshape(-1, num_cols)
+    results = pd.DataFrame({'step': step,
+                            'condition': [labels.get(n, '') for n in step],
+                            'run': run.reshape(-1)})
+    values = pd.DataFrame(values, columns=['timestamp', *calchemIDs])
+    results = pd.concat([results, values], axis=1)
+    # Drop NaN padding
+    return results[~np.isnan(values['timestamp'].to_numpy())]
+
+
+def _table_to_concentrations(results, calchemIDs, num_steps):
+    """Convert run table to NaN padded 3D concentrations array."""
+    num_steps = max([num_steps, *results['step']])
+    max_runs = max([1, *results['run']])
+    concentrations = np.full((num_steps, len(calchemIDs) + 1, max_runs),
+                             np.nan)
+    values = results[['timestamp', *calchemIDs]].to_numpy(dtype=float)
+    concentrations[results['step'].to_numpy() - 1, :,
+                   results['run'].to_numpy() - 1] = values
+    return concentrations
 
 
 def convert_index(dataframe):
@@ -239,10 +629,11 @@ def get_timepassed(concentrations, switch_to_hours=2, expt=None):
 
     Parameters
     ----------
-    concentrations : numpy.ndarray
-        3D matrix of concentrations for each molecule, gc collection,
-        and condition
-        [Condition x [Timestamps, ChemID] x run number
+    concentrations : pandas.DataFrame or numpy.ndarray
+        Per-run results from :func:`load_run_results` or 3D matrix of
+        concentrations for each molecule, gc collection, and condition
+        [Condition x [Timestamps, ChemID] x run number] from
+        :func:`load_results`
     switch_to_hours : `float`, optional
         Time in hours when the output should switch units to
         hours instead of minutes. The default is 2.
@@ -255,7 +646,10 @@ def get_timepassed(concentrations, switch_to_hours=2, expt=None):
         Either 'min' or 'hr' based on the length of total time and parameters.
 
     """
-    time_stamps = concentrations[:, 0, :].reshape(-1)
+    if isinstance(concentrations, pd.DataFrame):
+        time_stamps = concentrations['timestamp'].to_numpy()
+    else:
+        time_stamps = concentrations[:, 0, :].reshape(-1)
     time_stamps = time_stamps[~np.isnan(time_stamps)]
 
     # Experiments after 20230225 save w/ timestamp
@@ -439,7 +833,177 @@ def analyze_cal_data(expt, calDF, figsize=(6.5, 4.5), force_zero=True):
     return (run_num_plots, calibration_plots)
 
 
-def run_analysis(expt, calDF, basecorrect='True', savedata='True'):
+_worker_calibration = None
+"""GCCalibration sent once to each worker process by _init_worker."""
+
+
+def _init_worker(calibration):
+    """Store compiled calibration in a worker process of analyze_files."""
+    global _worker_calibration
+    _worker_calibration = calibration
+
+
+def _analyze_file(filepath, calibration=None):
+    """
+    Compute concentration row and peak table for one GC data file.
+
+    Module level so it can be sent to worker processes. If calibration is not
+    given, the calibration stored by :func:`_init_worker` is used.
+    """
+    if calibration is None:
+        calibration = _worker_calibration
+    # data is an instance of a class, for signal use data.signal etc
+    data = GCData(filepath, basecorrect=True)
+    # TODO add error output to GC_Data.get_concentrations()
+    # values, err = data.get_concentrations(calDF)
+    # conc_err.append(err.tolist())
+    return data.get_concentration_row(calibration), data.get_peak_table()
+
+
+def file_stat(filepath):
+    """
+    Return (size, modification time) used to detect changed files.
+
+    Parameters
+    ----------
+    filepath : str
+        Full path to file.
+
+    Returns
+    -------
+    tuple(int, int)
+        (size in bytes, modification time in ns)
+    """
+    stat = os.stat(filepath)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def analyze_files(file_list, calibration, workers=None, cache=None):
+    """
+    Compute concentration rows for many GC data files.
+
+    Files are processed serially by default. When workers > 1, files are
+    processed on a :class:`~concurrent.futures.ProcessPoolExecutor`. The
+    calibration is sent to each worker once when it starts rather than with
+    every file. Scripts using workers must protect their entry point with
+    ``if __name__ == "__main__":`` (required on Windows).
+
+    Parameters
+    ----------
+    file_list : list[str]
+        Full paths to GC data files.
+    calibration : GCCalibration
+        Compiled calibration used for all files.
+    workers : `int`, optional
+        Number of worker processes. The default is None (serial).
+    cache : `dict`, optional
+        Previous results from :func:`load_analysis_cache`, keyed by
+        normalized file path (os.path.normpath). Files whose size and
+        modification time match their cache entry are not reprocessed.
+        New results are added to cache in place. The default is None.
+
+    Returns
+    -------
+    list[numpy.ndarray]
+        [timestamp, ppm of chem 1, ..., ppm of chem N] for each file, in the
+        same order as file_list.
+    """
+    if cache is None:
+        cache = {}
+    # Cache is keyed on normalized paths so separators don't cause misses
+    file_list = [os.path.normpath(filepath) for filepath in file_list]
+    stats = {filepath: file_stat(filepath) for filepath in file_list}
+    todo = [filepath for filepath in file_list
+            if filepath not in cache
+            or cache[filepath]['stat'] != stats[filepath]]
+
+    if not workers or workers <= 1 or len(todo) <= 1:
+        results = [_analyze_file(filepath, calibration) for filepath in todo]
+    else:
+        # Send several files per task to limit communication overhead
+        chunksize = max(1, len(todo) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(calibration,)) as executor:
+            results = list(executor.map(_analyze_file, todo,
+                                        chunksize=chunksize))
+
+    for filepath, (conc, peaks) in zip(todo, results):
+        cache[filepath] = {'stat': stats[filepath],
+                           'conc': conc, 'peaks': peaks}
+    return [cache[filepath]['conc'] for filepath in file_list]
+
+
+_CACHE_VERSION = 1
+"""int: Increment when GC processing changes to invalidate saved caches."""
+
+
+def _cache_key(calibration, basecorrect):
+    """Return key describing the settings cached results depend on."""
+    return (_CACHE_VERSION, bool(basecorrect), calibration.hash)
+
+
+def load_analysis_cache(expt, calibration, basecorrect=True):
+    """
+    Load per-file analysis results saved by :func:`save_analysis_cache`.
+
+    Results are only returned if they were computed with the same
+    calibration and processing settings, otherwise the cache is empty.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment object with results_path and data_path.
+    calibration : GCCalibration
+        Compiled calibration that will be used for analysis.
+    basecorrect : `bool`, optional
+        Baseline correction setting used for analysis. The default is True.
+
+    Returns
+    -------
+    dict
+        {normalized full file path: {'stat': (size, mtime),
+        'conc': numpy.ndarray, 'peaks': dict}} for use with
+        :func:`analyze_files`.
+    """
+    cache_path = os.path.join(expt.results_path, 'analysis_cache.pkl')
+    if not os.path.isfile(cache_path):
+        return {}
+    with open(cache_path, 'rb') as f:
+        saved = pickle.load(f)
+    if saved.get('key') != _cache_key(calibration, basecorrect):
+        return {}
+    # Paths are saved relative to data folder in case expt is moved
+    return {os.path.normpath(os.path.join(expt.data_path, relpath)): entry
+            for relpath, entry in saved['files'].items()}
+
+
+def save_analysis_cache(expt, cache, calibration, basecorrect=True):
+    """
+    Save per-file analysis results to expt.results_path/analysis_cache.pkl.
+
+    Parameters
+    ----------
+    expt : Experiment
+        Experiment object with results_path and data_path.
+    cache : dict
+        Per-file results updated by :func:`analyze_files`.
+    calibration : GCCalibration
+        Compiled calibration used for analysis.
+    basecorrect : `bool`, optional
+        Baseline correction setting used for analysis. The default is True.
+    """
+    # relpath also normalizes, so keys match load_analysis_cache
+    files = {os.path.relpath(filepath, expt.data_path): entry
+             for filepath, entry in cache.items()}
+    saved = {'key': _cache_key(calibration, basecorrect), 'files': files}
+    cache_path = os.path.join(expt.results_path, 'analysis_cache.pkl')
+    with open(cache_path, 'wb') as f:
+        pickle.dump(saved, f)
+
+
+def run_analysis(expt, calDF, basecorrect='True', savedata='True',
+                 prefer_chr=False, workers=None, use_cache=False):
     """
     Compute the concentrations, averages, and error from GC runs.
 
@@ -460,7 +1024,19 @@ def run_analysis(expt, calDF, basecorrect='True', savedata='True'):
         Indicates whether or not to baseline correct individual gc data.
         The default is 'True'.
     savedata : `bool`, optional
-        Indicates whether or not to save data. The default is 'True'.
+        Indicates whether or not to save data. Per-run concentrations are
+        saved as run_results.csv, see :func:`load_run_results`.
+        The default is 'True'.
+    prefer_chr : `bool`, optional
+        Read binary .CHR files in place of .ASC files when both are present.
+        Faster to read and gives identical data. The default is False.
+    workers : `int`, optional
+        Number of processes used to analyze data files in parallel, see
+        :func:`analyze_files`. The default is None (serial).
+    use_cache : `bool`, optional
+        Reuse results of files that have not changed since the last analysis
+        with the same calibration, see :func:`load_analysis_cache`. The cache
+        is updated in expt.results_path. The default is False.
 
     Returns
     -------
@@ -483,19 +1059,14 @@ def run_analysis(expt, calDF, basecorrect='True', savedata='True'):
     expt_results_fol = expt.results_path
     os.makedirs(expt_results_fol, exist_ok=True)  # Make dir if not there
     calchemIDs = calDF.index.to_numpy()  # get chem IDs from calibration files
-    max_runs = 0
-    step_path_list = []
-    for dirpath, dirnames, filenames in os.walk(expt_data_fol):
-        # only looks at .ASC
-        num_data_points = len(list_matching_files(dirpath, 'FID', '.asc'))
-
-        # determine bottom most dirs
-        if not dirnames:
-            step_path_list.append(dirpath)
-
-        # Determines largest # of runs in any dir
-        if num_data_points > max_runs:
-            max_runs = num_data_points
+    calibration = GCCalibration(calDF)  # Compile once for all files
+    # One pass over data folder, folders directly inside are experiment steps
+    suffixes = ('.asc', '.chr') if prefer_chr else ('.asc',)
+    data_dirs = scan_step_dirs(expt_data_fol, suffixes=suffixes)
+    step_path_list = list(data_dirs)
+    # Determines largest # of runs in any dir
+    max_runs = max([len(data_dirs[step_path][('FID', '.asc')])
+                    for step_path in step_path_list], default=0)
 
     # Preallocate empty numpy array with NAN values
     num_fols = len(step_path_list)
@@ -505,78 +1076,49 @@ def run_analysis(expt, calDF, basecorrect='True', savedata='True'):
     # TODO create err np.array
     # err_concentrations = np.full((num_fols, num_chems + 1, max_runs), np.nan)
 
-    # Loops through the ind var step and calculates conc in each data file
+    # Loops through the ind var step and finds data files for each
+    step_files = []
     for step_path in step_path_list:
         print(os.path.basename(step_path))
         step_num, step_val = os.path.basename(step_path).split(' ')
         step_num = int(step_num) - 1
-        data_list = list_matching_files(step_path, 'FID', '.asc')
+        data_list = select_data_files(data_dirs[step_path], 'FID', '.asc',
+                                      prefer='.chr' if prefer_chr else None)
+        # Put runs in the order they were collected
+        data_list, _ = sort_by_timestamp(data_list)
         condition[step_num] = step_val
-        conc = []
-        # conc_err = [] TODO
-        for filepath in data_list:
-            # data is an instance of a class, for signal use data.signal etc
-            data = GCData(filepath, basecorrect=True)
-
-            values = data.get_concentrations(calDF)
-            # TODO add error output to GC_Data.get_concentrations()
-            # values, err = data.get_concentrations(calDF)
-            # conc_err.append(err.tolist())
-            conc.append(values.tolist())
-
-        num_runs = len(conc)
+        step_files.append((step_num, data_list))
+
+    # Calculate conc in every data file, results keep file order
+    all_files = [filepath for _, data_list in step_files
+                 for filepath in data_list]
+    # GCData is currently always baseline corrected in _analyze_file
+    cache = load_analysis_cache(expt, calibration) if use_cache else None
+    all_conc = analyze_files(all_files, calibration, workers=workers,
+                             cache=cache)
+    if use_cache:
+        # Only keep files still in the data folder
+        cache = {filepath: cache[filepath] for filepath
+                 in map(os.path.normpath, all_files)}
+        save_analysis_cache(expt, cache, calibration)
+
+    # Split results back up by step
+    n = 0
+    for step_num, data_list in step_files:
+        num_runs = len(data_list)
+        conc = all_conc[n:n + num_runs]
+        n += num_runs
         # [Condition x [Timestamps, ChemID] x run number]
         concentrations[step_num, :, 0:num_runs] = np.asarray(conc).T
         # err_concentrations[step_num, :, 0:num_runs] = np.asarray(conc).T
 
-    # Pull out "Active" Units from expt_list DF
-    units = (expt.expt_list['Units']
-             [expt.expt_list['Active Status']].to_string(index=False))
+    # One row per data file, saved instead of NaN padded concentrations
+    results = _build_run_table(step_files, all_conc, condition, calchemIDs)
+    avg, std = summarize_run_results(expt, results, condition)
 
-    if expt.expt_type == 'stability_test':
-        # Reset "condition" to be time passed for stability tests
-        # TODO This could check unit if expt_list updates
-        # to have time instead of temp in future.
-
-        # Don't switch unit, get time passed in minutes.
-        time_passed, _ = get_timepassed(concentrations,
-                                        switch_to_hours=1e9, expt=expt)
-        # Make sure time is chronological
-        order = np.argsort(time_passed)
-        condition = time_passed[order]  # Rewrite condition as time passed
-
-        idx_name = 'time [min]'  # We can get rid of this and else if TODO done
-        avg_dat = concentrations[0, 1:, order]
-        # TODO add err_concentration values to std
-        std_dat = avg_dat * 0
-
-    else:
-        idx_name = (expt.ind_var + ' [' + units + ']')  # Sweep Parameter
-        avg_dat = np.nanmean(concentrations[:, 1:, :], axis=2)
-        # TODO add err_concentration values to std
-        std_dat = np.nanstd(concentrations[:, 1:, :], axis=2)
-
-    # Redefine condition list as pandas index so we can assign a name
-    condition = pd.Index(condition, name=idx_name)
-
-    if units == 'frac':  # Change label style to stacked compositions.
-        condition = condition.str.replace('_', '\n')
-        condition = condition.str.replace('frac', '')
-
-    elif expt.expt_type == 'stability_test':
-        pass  # Already Float
-
-    else:  # Convert folder name to float w/o units.
-        condition = condition.str.replace(r'\D', '', regex=True).astype(float)
-
-    # Results
-    ###########################################################################
-    avg = pd.DataFrame(avg_dat, columns=calchemIDs, index=condition)
-    # TODO add err_concentration values to std
-    std = pd.DataFrame(std_dat, columns=calchemIDs, index=condition)
     if savedata:
-        np.save(os.path.join(expt_results_fol, 'concentrations'),
-                concentrations)
+        results.to_csv(os.path.join(expt_results_fol, 'run_results.csv'),
+                       index=False)
         avg.to_csv(os.path.join(expt_results_fol, 'avg_conc.csv'))
         std.to_csv(os.path.join(expt_results_fol, 'std_conc.csv'))
     print('Finished analyzing ' + expt.expt_name)
@@ -631,7 +1173,7 @@ def calculate_X_and_S(expt, reactant, target_molecule):
                                      {C_{total}*X^{2}})^{2}}
 
     """
-    concentrations, avg, std = load_results(expt)
+    avg, std = load_avg_std(expt)
     # Compute relevant concentrations
     C_tot = avg.sum(axis=1)  # total conc. of all molecules
     C_reactant = avg[reactant]  # total conc. of reactant molecule
@@ -24,6 +24,7 @@ from dataclasses import dataclass, fields, is_dataclass
 
 
 import catalight.analysis.tools as analysis_tools
+from catalight.analysis.catalog import list_expt_logs
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (QDialogButtonBox, QItemDelegate, QDialog,
                              QApplication, QTreeWidget, QAbstractItemView,
@@ -472,7 +473,10 @@ class DataExtractor(QDialog):
         Open file dialog and let user select directories to analyze.
 
         Then finds files matching target and suffix provided and calls
-        populateTree() using those filepaths. Updates pathRoot.
+        populateTree() using those filepaths. Updates pathRoot. expt_log.txt
+        and avg_conc.csv files are found with
+        :func:`~catalight.analysis.catalog.list_expt_logs` instead of
+        searching every folder.
 
         Returns
         -------
@@ -482,8 +486,19 @@ class DataExtractor(QDialog):
         selector = DirectorySelector(self.starting_dir)
         if selector.exec_() == QDialog.Accepted:
             expt_dirs = selector.get_output()
-        filepaths = analysis_tools.list_matching_files(expt_dirs, self.target,
-                                                       self.suffix)
+        if (self.target, self.suffix) == ('expt_log', '.txt'):
+            filepaths = list_expt_logs(expt_dirs)
+        elif (self.target, self.suffix) == ('avg_conc', '.csv'):
+            # Results of each cataloged experiment, instead of crawling data
+            filepaths = [os.path.join(os.path.dirname(log_path), 'Results',
+                                      'avg_conc.csv')
+                         for log_path in list_expt_logs(expt_dirs)]
+            filepaths = [filepath for filepath in filepaths
+                         if os.path.isfile(filepath)]
+        else:
+            filepaths = analysis_tools.list_matching_files(expt_dirs,
+                                                           self.target,
+                                                           self.suffix)
         self.pathRoot = os.path.dirname(expt_dirs[0])
         # function populates tree items based on matching criteria specified
         self.populateTree(filepaths)
@@ -24,6 +24,8 @@ from catalight.equipment.light_sources.diode_control import Diode_Laser
 from catalight.equipment.heating.watlow import Heater
 from catalight.equipment.gc_control.sri_gc import GC_Connector
 from catalight.equipment.experiment_control import Experiment
+from catalight.equipment.telemetry import (TelemetrySampler, read_laser,
+                                             read_heater)
 import catalight.config as cfg
 
 import matplotlib.pyplot as plt
@@ -74,6 +76,8 @@ class MainWindow(QMainWindow):
         self.manual_ctrl_thread = Worker(self.manual_ctrl_eqpt)
         self.run_study_thread.setAutoDelete(False)
         self.manual_ctrl_thread.setAutoDelete(False)
+        self.telemetry = TelemetrySampler(interval=0.5)
+        """Background readings of connected equipment shown in live view"""
 
         # Initilize equipment
         self.loading_screen.status_msg.setText('Initializing Equipment...')
@@ -142,6 +146,7 @@ class MainWindow(QMainWindow):
             expt.sample_name = sample_name
             expt.create_dirs(main_fol)
             expt.update_eqpt_list(eqpt_list)
+            expt.telemetry = self.telemetry
             print(expt.expt_name)
             print(expt.sample_name)
             expt.run_experiment()
@@ -291,6 +296,7 @@ class MainWindow(QMainWindow):
 
         self.loading_screen.progress_bar.setValue(85)
         self.set_form_limits()
+        self.update_telemetry_sources()
 
     def init_study_tab(self):
         """Connect Study Overview Tab Contents (signals/slots)."""
@@ -558,6 +564,7 @@ class MainWindow(QMainWindow):
 
         else:
             self.laser_Status.setChecked(0)
+        self.update_telemetry_sources()
         self.update_flag = True
         self.update_power_estimate()
 
@@ -951,43 +958,71 @@ class MainWindow(QMainWindow):
         self.plotWidgetDesign.canvas.draw()
         self.plotWidgetDesign.canvas.show()
 
+    def update_telemetry_sources(self):
+        """
+        Sample each connected piece of equipment in the background.
+
+        Called after connecting equipment or changing the active laser.
+        Readings are stored in self.telemetry and displayed by
+        update_eqpt_status().
+        """
+        if self.laser_Status.isChecked() and self.laser_controller:
+            self.telemetry.add_source(
+                'laser', lambda laser=self.laser_controller: read_laser(laser))
+        else:
+            self.telemetry.remove_source('laser')
+
+        if self.heater_Status.isChecked():
+            self.telemetry.add_source(
+                'heater', lambda heater=self.heater: read_heater(heater))
+        else:
+            self.telemetry.remove_source('heater')
+
+        if self.gas_Status.isChecked():
+            self.telemetry.add_source('gas', self.gas_controller.read_flows)
+        else:
+            self.telemetry.remove_source('gas')
+
     def update_eqpt_status(self):
         """
         Update the equipment live view.
 
         This function updates the live view of the equipment in both the
-        manual control (1) and the live view (2) tabs
+        manual control (1) and the live view (2) tabs using the latest
+        readings in self.telemetry, so the GUI never waits on the equipment.
         """
-        if self.laser_Status.isChecked():
+        laser = self.telemetry.latest('laser')
+        if self.laser_Status.isChecked() and laser is not None:
 
-            self.current_power_1.setText('%.2f' % self.laser_controller.get_output_power())
-            self.current_power_2.setText('%.2f' % self.laser_controller.get_output_power())
-            self.current_power_setpoint1.setText('%.2f' % self.laser_controller.P_set)
-            self.current_power_setpoint2.setText('%.2f' % self.laser_controller.P_set)
+            self.current_power_1.setText('%.2f' % laser['power'])
+            self.current_power_2.setText('%.2f' % laser['power'])
+            self.current_power_setpoint1.setText('%.2f' % laser['P_set'])
+            self.current_power_setpoint2.setText('%.2f' % laser['P_set'])
 
             # If applicable, update bandpass settings
-            if self.laser_controller.is_tunable:
-                # Get current setpoints directly from bandpass filter
-                bandwidth = (self.laser_controller.bandwidth)
-                center = (self.laser_controller.central_wavelength)
+            if 'center' in laser:
+                # Setpoints are read directly from bandpass filter
+                bandwidth = laser['bandwidth']
+                center = laser['center']
 
                 self.current_center_1.setText('%.2f' % center)
                 self.current_center_2.setText('%.2f' % center)
                 self.current_bandwidth_1.setText('%.2f' % bandwidth)
                 self.current_bandwidth_2.setText('%.2f' % bandwidth)
-                self.current_center_setpoint1.setText('%.2f' % self.laser_controller.central_wavelength)
-                self.current_center_setpoint2.setText('%.2f' % self.laser_controller.central_wavelength)
-                self.current_bandwidth_setpoint1.setText('%.2f' % self.laser_controller.bandwidth)
-                self.current_bandwidth_setpoint2.setText('%.2f' % self.laser_controller.bandwidth)
-
-        if self.heater_Status.isChecked():
-            self.current_temp_1.setText('%.2f' % self.heater.read_temp())
-            self.current_temp_2.setText('%.2f' % self.heater.read_temp())
-            self.current_temp_setpoint1.setText('%.2f' % self.heater.read_setpoint())
-            self.current_temp_setpoint2.setText('%.2f' % self.heater.read_setpoint())
-
-        if self.gas_Status.isChecked():
-            flow_dict = self.gas_controller.read_flows()
+                self.current_center_setpoint1.setText('%.2f' % center)
+                self.current_center_setpoint2.setText('%.2f' % center)
+                self.current_bandwidth_setpoint1.setText('%.2f' % bandwidth)
+                self.current_bandwidth_setpoint2.setText('%.2f' % bandwidth)
+
+        heater = self.telemetry.latest('heater')
+        if self.heater_Status.isChecked() and heater is not None:
+            self.current_temp_1.setText('%.2f' % heater['temp'])
+            self.current_temp_2.setText('%.2f' % heater['temp'])
+            self.current_temp_setpoint1.setText('%.2f' % heater['setpoint'])
+            self.current_temp_setpoint2.setText('%.2f' % heater['setpoint'])
+
+        flow_dict = self.telemetry.latest('gas')
+        if self.gas_Status.isChecked() and flow_dict is not None:
             self.current_gasA_comp_1.setText('%.2f' % flow_dict['mfc_A']['mass_flow'])
             self.current_gasA_pressure_1.setText('%.2f' % flow_dict['mfc_A']['pressure'])
             self.current_gasA_type_1.setText(flow_dict['mfc_A']['gas'])
@@ -1220,6 +1255,7 @@ class MainWindow(QMainWindow):
 
     def disconnect(self):
         """Run shutdown sequence then disconnect communications."""
+        self.telemetry.stop()  # Don't read from closing connections
         self.shut_down()
         if self.gas_Status.isChecked():
             self.gas_controller.disconnect()
@@ -0,0 +1,173 @@
+"""
+Record readings of all connected equipment to one file.
+
+:class:`EquipmentLogger` reads every added device at the same moment on a
+background thread and writes one row per sample, so laser, heater, and MFC
+states share a single time column. Rows are kept in memory and written in
+batches to a file that stays open while logging, instead of opening the file
+for every sample. Times are time.time() like
+:attr:`~catalight.equipment.experiment_control.Experiment.journal`, so the
+log can be cut into steps with the journal events.
+
+Example
+-------
+>>> logger = EquipmentLogger('equipment_log.csv', interval=1)
+>>> logger.add_device('heater', lambda: read_heater(heater))
+>>> logger.start()
+>>> logger.stop()
+"""
+import csv
+import os
+import threading
+import time
+
+
+class EquipmentLogger():
+    """
+    Sample devices at a fixed interval and append readings to a csv file.
+
+    Nested readings are flattened into one column each, named
+    'device.key.subkey' (e.g. 'gas.mfc_A.mass_flow'). Columns are set by the
+    first batch of samples. Failed reads are left blank. If save_path already
+    exists, rows are appended below the existing ones.
+
+    Parameters
+    ----------
+    save_path : str
+        Full path of the csv file to write, e.g. '.../equipment_log.csv'.
+    interval : `float`, optional
+        Time between samples in seconds. The default is 1.
+    flush_size : `int`, optional
+        Number of samples kept in memory before writing them to file.
+        The default is 60.
+    """
+
+    def __init__(self, save_path, interval=1, flush_size=60):
+        self.save_path = save_path
+        """Full path of the csv file being written"""
+        self.interval = interval
+        """Time between samples in seconds"""
+        self.flush_size = flush_size
+        """Number of samples kept in memory before writing them to file"""
+        self._devices = {}  # {name: read_func}
+        self._failed = set()  # Devices whose last read failed
+        self._rows = []
+        self._fieldnames = None
+        self._file = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def devices(self):
+        """list[str]: Names of devices being logged."""
+        return list(self._devices)
+
+    def add_device(self, name, read_func):
+        """
+        Add a device to each sample.
+
+        Parameters
+        ----------
+        name : str
+            Prefix of the device's columns, e.g. 'heater'.
+        read_func : callable
+            Function without arguments returning a number, string, or (nested)
+            dict of them. None leaves the device's cells blank. Should not be
+            added once logging has started.
+        """
+        self._devices[name] = read_func
+
+    def sample(self):
+        """
+        Read every device once and buffer the row.
+
+        Returns
+        -------
+        dict
+            {column: value} of the new row, including 'time'.
+        """
+        row = {'time': time.time()}
+        for name, read_func in self._devices.items():
+            try:
+                reading = read_func()
+            except Exception as e:
+                if name not in self._failed:  # Don't print every sample
+                    print('Logging %s failed:' % name, e)
+                self._failed.add(name)
+                continue
+            self._failed.discard(name)
+            if reading is not None:  # e.g. no recent telemetry
+                row.update(_flatten(reading, name))
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.flush_size
+        if full:
+            self.flush()
+        return row
+
+    def flush(self):
+        """Write buffered samples to file."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if not rows:
+                return
+            if self._writer is None:
+                self._open(rows)
+            self._writer.writerows(rows)
+            self._file.flush()
+
+    def start(self):
+        """Start sampling on a background thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling, write remaining samples and close the file."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _open(self, rows):
+        """Open save_path for appending and match or write the header."""
+        new_file = (not os.path.isfile(self.save_path)
+                    or os.path.getsize(self.save_path) == 0)
+        if new_file:  # Use every column of first batch in case a read failed
+            self._fieldnames = list(dict.fromkeys(
+                column for row in rows for column in row))
+        else:  # Keep existing columns so appended rows line up
+            with open(self.save_path, newline='') as log:
+                self._fieldnames = next(csv.reader(log))
+        self._file = open(self.save_path, 'a', newline='')
+        self._writer = csv.DictWriter(self._file, self._fieldnames,
+                                      restval='', extrasaction='ignore')
+        if new_file:
+            self._writer.writeheader()
+
+    def _run(self):
+        """Sample every interval until stop is called."""
+        next_time = time.time()
+        while not self._stop_event.is_set():
+            self.sample()
+            # Schedule from start times so slow reads don't add drift
+            next_time = max(next_time + self.interval, time.time())
+            self._stop_event.wait(max(0, next_time - time.time()))
+
+
+def _flatten(reading, prefix):
+    """Return {'prefix.key.subkey': value} for a (nested) dict reading."""
+    if not isinstance(reading, dict):
+        return {prefix: reading}
+    flat = {}
+    for key, value in reading.items():
+        flat.update(_flatten(value, '%s.%s' % (prefix, key)))
+    return flat
@@ -0,0 +1,103 @@
+"""
+Thread safe access to equipment connections.
+
+The GUI, the experiment thread, and equipment loggers can all talk to the same
+serial/DAQ connection. Each equipment class owns a :class:`DeviceLock` and
+wraps every exchange with the device in it::
+
+    with self.lock:
+        temp = self.controller.read()['data']
+
+Threads waiting for the device sleep inside the lock instead of polling, and
+checking and taking the lock happens in one step so two threads can't both
+start talking to the device.
+"""
+import threading
+from contextlib import contextmanager
+
+
+class DeviceLock():
+    """
+    Reentrant lock guarding access to one piece of equipment.
+
+    The thread holding the lock can acquire it again, so locked methods can
+    call other locked methods of the same device. Use as a context manager or
+    call :meth:`access` to wait for a specific time.
+
+    Parameters
+    ----------
+    name : `str`, optional
+        Device name used in timeout messages. The default is 'device'.
+    timeout : `float`, optional
+        Default time in seconds to wait for the device before raising
+        TimeoutError. The default is None (wait forever).
+    """
+
+    def __init__(self, name='device', timeout=None):
+        self.name = name
+        """Device name used in timeout messages"""
+        self.timeout = timeout
+        """Default time in seconds to wait for the device, None is forever"""
+        self._lock = threading.RLock()
+        self._depth = 0  # Number of nested acquires by the owning thread
+
+    @property
+    def is_busy(self):
+        """True while any thread is using the device, read-only."""
+        return self._depth > 0
+
+    def acquire(self, timeout=None):
+        """
+        Wait for the device to be free and take control of it.
+
+        Parameters
+        ----------
+        timeout : `float`, optional
+            Time in seconds to wait before raising TimeoutError.
+            The default is None, which uses the timeout attribute.
+
+        Raises
+        ------
+        TimeoutError
+            The device was still in use after timeout seconds.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError('%s still busy after %s s'
+                               % (self.name, timeout))
+        self._depth += 1
+
+    def release(self):
+        """Release control of the device."""
+        self._depth -= 1
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    @contextmanager
+    def access(self, timeout=None):
+        """
+        Context manager holding the device, waiting up to timeout seconds.
+
+        Parameters
+        ----------
+        timeout : `float`, optional
+            Time in seconds to wait before raising TimeoutError.
+            The default is None, which uses the timeout attribute.
+
+        Yields
+        ------
+        DeviceLock
+            This lock.
+        """
+        self.acquire(timeout)
+        try:
+            yield self
+        finally:
+            self.release()
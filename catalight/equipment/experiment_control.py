@@ -4,16 +4,29 @@ This module contains the Experiment class and any future add ons.
 Created on Tue Dec 21 08:30:33 2021.
 @author: Briley Bourgeois
 """
+import json
 import re
 import os
 import time
 from ast import literal_eval
 from datetime import date
+from functools import partial
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from catalight.equipment.data_logger import EquipmentLogger
+from catalight.equipment.telemetry import read_heater, read_laser
+
+
+def _json_default(value):
+    """Convert numpy numbers to python numbers for json.dump."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('Object of type %s is not JSON serializable'
+                    % type(value).__name__)
+
 
 class Experiment:
     """
@@ -91,6 +104,7 @@ class Experiment:
         self._expt_name = 'Undefined'
         self._results_path = 'Undefined'
         self._data_path = 'Undefined'
+        self._journal = []
 
         # Define attributes and set default
         # ---------------------------------
@@ -112,6 +126,19 @@ class Experiment:
         self.heat_rate = 15
         """int or float: (deg C/min) Ramp rate to use when heating reactor."""
 
+        self.telemetry = None
+        """
+        TelemetrySampler or None: Background readings of the equipment. When
+        set, status printouts use its 'heater' readings instead of querying
+        the heater.
+        """
+
+        self.log_interval = 1
+        """
+        int or float: (s) Time between equipment readings saved to
+        equipment_log.csv while the experiment runs.
+        """
+
         if eqpt_list is not False:
             self.update_eqpt_list(eqpt_list)
 
@@ -297,6 +324,77 @@ class Experiment:
     Given by time.time() at the **end** of initial conditions steps.
     """
 
+    journal = property(lambda self: self._journal)
+    """
+    list[list], read-only: [time, step number, event] for events during the
+    last run, in the order they happened. time is given as time since epoch
+    and step numbers start at 1. Events are listed in :attr:`journal_events`.
+    Updated by :meth:`run_experiment` and saved in expt_log.json.
+    """
+
+    journal_events = ('ramp_start', 'ramp_end', 'steady_state_start',
+                      'gc_start', 'collection_end', 'step_end')
+    """
+    tuple[str]: Events recorded in :attr:`journal` for each step.
+    ramp_start/ramp_end surround changing the step condition (heater ramp for
+    temperature sweeps), steady_state_start is when waiting for steady state
+    begins, gc_start is when the first GC run of the step is started,
+    collection_end is when the last GC run of the step is started, and
+    step_end is after t_buffer.
+    """
+
+    @property
+    def step_times(self):
+        """
+        list[dict], read-only: {event: time} for each step from
+        :attr:`journal`. Index 0 is step 1.
+        """
+        step_times = []
+        for event_time, step_num, event in self._journal:
+            while len(step_times) < step_num:
+                step_times.append({})
+            step_times[step_num - 1][event] = event_time
+        return step_times
+
+    def get_step_interval(self, step_num, start='gc_start',
+                          end='collection_end'):
+        """
+        Return the logged times of two events during a step.
+
+        Parameters
+        ----------
+        step_num : int
+            Step number, starting at 1.
+        start : `str`, optional
+            Event starting the interval. The default is 'gc_start'.
+        end : `str`, optional
+            Event ending the interval. The default is 'collection_end'.
+
+        Returns
+        -------
+        tuple(float, float)
+            (start time, end time) in time since epoch.
+
+        Raises
+        ------
+        KeyError
+            If either event was not recorded for the step.
+        """
+        times = self.step_times[step_num - 1]
+        return (times[start], times[end])
+
+    def _log_event(self, step_num, event):
+        """Append current time to :attr:`journal`."""
+        self._journal.append([time.time(), step_num, event])
+
+    def _read_temp(self, max_age=5):
+        """Return heater temp from :attr:`telemetry` if fresh, else read it."""
+        if self.telemetry is not None:
+            reading = self.telemetry.latest('heater', max_age=max_age)
+            if reading is not None:
+                return reading['temp']
+        return self._heater.read_temp()
+
     ind_var = property(lambda self: self._ind_var)
     """
     `str`, read-only: Describes the variable being modified. This gets updated
@@ -432,12 +530,47 @@ class Experiment:
             ]
             log.write('\n'.join(log_entry))
 
+        # Full state for fast reading, see read_expt_log
+        log_dict = {'date': self.date,
+                    'start_time': self.start_time,
+                    'expt_type': self.expt_type,
+                    'expt_name': self.expt_name,
+                    'sample_name': self.sample_name,
+                    'units': dict(zip(self.expt_list['Expt Name'],
+                                      self.expt_list['Units'])),
+                    'temp': self.temp,
+                    'power': self.power,
+                    'wavelength': self.wavelength,
+                    'bandwidth': self.bandwidth,
+                    'gas_type': self.gas_type,
+                    'gas_comp': self.gas_comp,
+                    'tot_flow': self.tot_flow,
+                    'sample_rate': self.sample_rate,
+                    'sample_set_size': self.sample_set_size,
+                    't_steady_state': self.t_steady_state,
+                    't_buffer': self.t_buffer,
+                    'heat_rate': self.heat_rate,
+                    'journal': self.journal}
+        # Write to temp file first so a failed dump can't leave partial json
+        json_path = os.path.join(expt_path, 'expt_log.json')
+        try:
+            with open(json_path + '.tmp', 'w') as log:
+                json.dump(log_dict, log, indent=4, default=_json_default)
+        except Exception:
+            os.remove(json_path + '.tmp')
+            raise
+        os.replace(json_path + '.tmp', json_path)
+
     def read_expt_log(self, log_path):
         """
         Read data from an existing log file and update object parameters.
 
         Grows gas_type list if more gasses are found in the expt_log than
-        contained in current gas_type list.
+        contained in current gas_type list. If expt_log.json exists next to
+        the log file and is at least as new, it is read instead. It holds
+        every value written by :meth:`update_expt_log` including those not in
+        expt_log.txt (sample_set_size, heat_rate, units, and journal). An
+        older json, e.g. after editing expt_log.txt by hand, is ignored.
 
         Parameters
         ----------
@@ -449,6 +582,12 @@ class Experiment:
         None
 
         """
+        json_path = os.path.join(os.path.dirname(log_path), 'expt_log.json')
+        if (os.path.isfile(json_path)
+                and os.path.getmtime(json_path) >= os.path.getmtime(log_path)):
+            self._read_json_log(json_path)
+            return
+
         with open(log_path, 'r') as log:
             for line in log:  # Read file line by line
                 # Read the values after '=' sign
@@ -503,6 +642,36 @@ class Experiment:
             # Will throw error if no data folders
             self.update_save_paths(expt_path)
 
+    def _read_json_log(self, json_path):
+        """Update object parameters from expt_log.json, see read_expt_log."""
+        with open(json_path, 'r') as log:
+            log_dict = json.load(log)
+        self._date = log_dict['date']
+        self._start_time = log_dict['start_time']
+        self.expt_type = log_dict['expt_type']
+        self._expt_name = log_dict['expt_name']
+        self.sample_name = log_dict['sample_name']
+        units = log_dict.get('units', {})
+        self._expt_list['Units'] = [units.get(name, unit) for name, unit
+                                    in zip(self.expt_list['Expt Name'],
+                                           self.expt_list['Units'])]
+        self.temp = log_dict['temp']
+        self.power = log_dict['power']
+        self._wavelength = log_dict['wavelength']
+        self._bandwidth = log_dict['bandwidth']
+        self.gas_type = log_dict['gas_type']
+        self.gas_comp = log_dict['gas_comp']
+        self.tot_flow = log_dict['tot_flow']
+        self.sample_rate = log_dict['sample_rate']
+        self.sample_set_size = log_dict.get('sample_set_size',
+                                            self.sample_set_size)
+        self.t_steady_state = log_dict['t_steady_state']
+        self.t_buffer = log_dict['t_buffer']
+        self.heat_rate = log_dict.get('heat_rate', self.heat_rate)
+        self._journal = log_dict.get('journal', [])
+        # Will throw error if no data folders
+        self.update_save_paths(os.path.dirname(json_path))
+
     def _update_expt_name(self):
         """
         Non-public function that updates expt_name based on current settings.
@@ -801,19 +970,26 @@ class Experiment:
         conditions. Will also check that the temperature is not more than
         10 degrees C above the first setpoint.
         The order is:
-        1.  Set temperature
-        2.  Give 1 minute time warning for laser
-        3.  Set initial laser power
-        4.  Check is laser is tunable, updates wavelength accordingly
-        5.  Set gas type
-        6.  Set gas flows
-        7.  Wait 2 minutes
-        8.  Print gas flows
-        9.  Update gc sample set size and sample rate
-        10. Update date, time, and update log
+        1.  Start ramping temperature in the background
+        2.  Set gas type
+        3.  Set gas flows
+        4.  Wait for temperature ramp to finish
+        5.  Give 1 minute time warning for laser
+        6.  Set initial laser power
+        7.  Check is laser is tunable, updates wavelength accordingly
+        8.  Wait until 2 minutes after setting gas flows
+        9.  Print gas flows
+        10. Update gc sample set size and sample rate
+        11. Update date, time, and update log
         """
         unit = self.expt_list['Units'][0]
-        self._heater.ramp(self.temp[0], temp_units=unit)
+        ramp = self._heater.start_ramp(self.temp[0], temp_units=unit)
+        # Gas steadies out while the reactor heats
+        self._gas_control.set_gasses(self.gas_type)
+        self._gas_control.set_flows(self.gas_comp[0], self.tot_flow[0])
+        t_gas_set = time.time()
+        ramp.wait()
+
         starting_temp = self._heater.read_temp()
         starting_sp = self._heater.read_setpoint()
         print('Starting Temp = ' + str(starting_temp) + ' C')
@@ -833,9 +1009,8 @@ class Experiment:
 
         self._laser_control.set_power(self.power[0])
 
-        self._gas_control.set_gasses(self.gas_type)
-        self._gas_control.set_flows(self.gas_comp[0], self.tot_flow[0])
-        time.sleep(120)  # Wait for gas to steady out
+        # Wait for gas to steady out
+        time.sleep(max(0, 120 - (time.time() - t_gas_set)))
         self._gas_control.print_flows()
         self._gc_control.sample_set_size = self.sample_set_size
         self._gc_control.sample_rate = self.sample_rate
@@ -848,7 +1023,7 @@ class Experiment:
         expt_path = os.path.dirname(self.data_path)
         self.update_expt_log(expt_path)
 
-    def run_experiment(self):
+    def run_experiment(self, calDF=None):
         """
         Directs connected equipment to run experiment based on attributes.
 
@@ -857,9 +1032,64 @@ class Experiment:
         attribute values for the object instance. This method currently works
         by using a series of if-statements to determine the experiment type
         and take the corresponding actions.
+
+        Parameters
+        ----------
+        calDF : pandas.DataFrame, optional
+            GC calibration data. If provided, GC data is analyzed in the
+            background as it is collected using
+            :class:`~catalight.analysis.live_analysis.LiveAnalyzer` so
+            results are current when the experiment ends.
+            The default is None (no live analysis).
         """
         print('Starting ' + self.expt_type + self.expt_name)
-        self.set_initial_conditions()
+        equipment_log = self._create_equipment_log()
+        equipment_log.start()
+        analyzer = None
+        try:
+            self.set_initial_conditions()
+            if calDF is not None:
+                # Import here, analysis subpackage imports this module
+                from catalight.analysis.live_analysis import LiveAnalyzer
+                analyzer = LiveAnalyzer(self, calDF)
+                analyzer.start()
+            self._journal = []
+            self._run_steps(analyzer)
+        finally:
+            if analyzer is not None:
+                analyzer.stop()
+            equipment_log.stop()
+        print('Finished ' + self.expt_type + self.expt_name)
+
+    def _create_equipment_log(self):
+        """
+        Create logger recording laser, heater, and gas readings.
+
+        The log is saved as equipment_log.csv in the experiment folder.
+        Readings come from :attr:`telemetry` when it samples the device so
+        logging doesn't add traffic on the equipment connections.
+
+        Returns
+        -------
+        EquipmentLogger
+            Logger with each device added. Not yet started.
+        """
+        save_path = os.path.join(os.path.dirname(self.data_path),
+                                 'equipment_log.csv')
+        logger = EquipmentLogger(save_path, interval=self.log_interval)
+        readers = {'laser': lambda: read_laser(self._laser_control),
+                   'heater': lambda: read_heater(self._heater),
+                   'gas': self._gas_control.read_flows}
+        for name, read_func in readers.items():
+            if self.telemetry is not None and name in self.telemetry.sources:
+                # Use cached readings, cells left blank if sampling stalls
+                read_func = partial(self.telemetry.latest, name,
+                                    max_age=max(2, 2 * self.log_interval))
+            logger.add_device(name, read_func)
+        return logger
+
+    def _run_steps(self, analyzer=None):
+        """Step through ind var, see :meth:`run_experiment`."""
         step_num = 1
         # Creates subfolders for each step of experiment
         for step in getattr(self, self._ind_var):
@@ -882,7 +1112,9 @@ class Experiment:
             else:
                 path = os.path.join(self.data_path,
                                     ('%i %d%s' % (step_num, step, units)))
+            journal_step = step_num
             step_num += 1
+            self._log_event(journal_step, 'ramp_start')
 
             # This chooses the run type and sets condition accordingly
             # --------------------------------------------------------
@@ -904,15 +1136,19 @@ class Experiment:
             elif self.expt_type == 'stability_test':
                 pass
                 # Stability Test conditions set in initial conditions
+            self._log_event(journal_step, 'ramp_end')
 
             # This segment times when to start GC and prints status
             # -----------------------------------------------------
             print('Waiting for steady state: '
                   + time.strftime("%H:%M:%S", time.localtime()))
             t1 = time.time()
+            self._log_event(journal_step, 'steady_state_start')
             while self._gc_control.is_running():
                 time.sleep(10)  # Don't update ctrl file while running
             self._gc_control.update_gc_settings(path)
+            if analyzer is not None:
+                analyzer.watch(path)
             t2 = time.time()
             t_passed = round(t2 - t1)  # GC can take a while to respond
             for i in range(int(self.t_steady_state * 60 - t_passed)):
@@ -921,8 +1157,9 @@ class Experiment:
 
             print('Starting Collection: '
                   + time.strftime("%H:%M:%S", time.localtime()))
-            print('Starting Temp = ', self._heater.read_temp(), ' C')
+            print('Starting Temp = ', self._read_temp(), ' C')
             self._gc_control.set_running()
+            self._log_event(journal_step, 'gc_start')
             # t_collect ends on last gc pull
             t_collect = self.sample_rate * (self.sample_set_size - 1) * 60
 
@@ -931,13 +1168,14 @@ class Experiment:
 
             print('Finished Collecting: '
                   + time.strftime("%H:%M:%S", time.localtime()))
+            self._log_event(journal_step, 'collection_end')
             time.sleep(self.t_buffer * 60)
-            print('Ending = ', self._heater.read_temp(), ' C')
+            print('Ending = ', self._read_temp(), ' C')
 
             print('Step Finished: '
                   + time.strftime("%H:%M:%S", time.localtime()))
-
-        print('Finished ' + self.expt_type + self.expt_name)
+            self._log_event(journal_step, 'step_end')
+            self.update_expt_log(os.path.dirname(self.data_path))
 
 
 if __name__ == "__main__":
@@ -1016,3 +1254,4 @@ if __name__ == "__main__":
     Expt6.plot_sweep()
     # Expt6.create_dirs(main_fol)
     print('finished Expt6')
+
@@ -6,11 +6,13 @@ Created on Sun Feb 13 20:56:51 2022.
 """
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 from alicat import FlowController, FlowMeter
 import catalight.config as cfg
+from catalight.equipment.device_lock import DeviceLock
 
 
 class Gas_System:
@@ -20,6 +22,10 @@ class Gas_System:
                       'D2', 'C2H6', 'C2H4', 'He', 'H2', 'Kr', 'CH4', 'Ne',
                       'N2', 'N2O', 'O2', 'C3H8', 'SF6', 'Xe']
     """Factory gas list saved to Alicat MFCs"""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
+    mfc_names = ['mfc_A', 'mfc_B', 'mfc_C', 'mfc_D', 'mfc_E']
+    """Attribute names of the MFCs, in the order of cfg.mfc_list"""
 
     def __init__(self):
         """
@@ -43,7 +49,56 @@ class Gas_System:
 
         self.mfc_E = FlowMeter(port=cfg.mfc_list[4]['port'],
                                address=cfg.mfc_list[4]['unit'])
-        self.is_busy = False
+        self.lock = DeviceLock('Gas System')  #: Device access lock
+
+        # MFCs on different COM ports are commanded from separate threads
+        self._ports = {name: cfg.mfc_list[i]['port']
+                       for i, name in enumerate(self.mfc_names)}
+
+    def _map_mfcs(self, func, mfc_args):
+        """
+        Call func(mfc, *args) for several MFCs, one thread per COM port.
+
+        MFCs sharing a port are called one after another in the order given,
+        so their messages never interleave on the serial line. Commands to
+        different ports overlap, so commanding all MFCs takes about one serial
+        round trip instead of one per MFC. Call with self.lock held.
+
+        Parameters
+        ----------
+        func : callable
+            Function taking the MFC object followed by args.
+        mfc_args : dict
+            {mfc_name: tuple of args} e.g. {'mfc_A': (10.0,)}
+
+        Returns
+        -------
+        dict
+            {mfc_name: return value of func} in the order of mfc_args.
+
+        Raises
+        ------
+        Exception
+            The first error raised by func, after all calls have finished.
+        """
+        if not mfc_args:
+            return {}
+        groups = {}
+        for name in mfc_args:
+            groups.setdefault(self._ports[name], []).append(name)
+
+        def run_group(names):
+            return [(name, func(getattr(self, name), *mfc_args[name]))
+                    for name in names]
+
+        # Pool lives for one call so no threads are left behind
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(run_group, names)
+                       for names in groups.values()]
+        results = {}
+        for future in futures:
+            results.update(future.result())  # Raises errors from worker
+        return {name: results[name] for name in mfc_args}
 
     def set_gasses(self, gas_list):
         """
@@ -67,15 +122,10 @@ class Gas_System:
             if gas_list_copy[i].lower() == 'calgas':
                 gas_list_copy[i] = 237
 
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        self.mfc_A.set_gas(gas_list_copy[0])
-        self.mfc_B.set_gas(gas_list_copy[1])
-        self.mfc_C.set_gas(gas_list_copy[2])
-        self.mfc_D.set_gas(gas_list_copy[3])
-        self.is_busy = False
+        mfc_args = {name: (gas,) for name, gas
+                    in zip(self.mfc_names[:4], gas_list_copy)}
+        with self.lock:
+            self._map_mfcs(lambda mfc, gas: mfc.set_gas(gas), mfc_args)
 
     def set_flows(self, comp_list, tot_flow):
         """
@@ -103,15 +153,11 @@ class Gas_System:
 
         """
         comp_list = self.check_comp_total(comp_list)
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        self.mfc_A.set_flow_rate(float(comp_list[0] * tot_flow))
-        self.mfc_B.set_flow_rate(float(comp_list[1] * tot_flow))
-        self.mfc_C.set_flow_rate(float(comp_list[2] * tot_flow))
-        self.mfc_D.set_flow_rate(float(comp_list[3] * tot_flow))
-        self.is_busy = False
+        mfc_args = {name: (float(comp * tot_flow),) for name, comp
+                    in zip(self.mfc_names[:4], comp_list)}
+        with self.lock:
+            self._map_mfcs(lambda mfc, flow: mfc.set_flow_rate(flow),
+                           mfc_args)
 
         self.set_gasE(comp_list)
 
@@ -131,39 +177,37 @@ class Gas_System:
         """
         comp_list = self.check_comp_total(comp_list)
 
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        gas_list = []
-        for mfc in [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]:
-            gas_name = mfc.get()['gas']
-            if gas_name.lower() == 'calgas':
-                gas_list.append('Ar')  # Can't handle custom mixes
-            else:
-                gas_list.append(gas_name)
-        # convert to percents, make dict, drop zero values
-        percents = np.array(comp_list, dtype=float) * 100
-        gas_series = pd.Series(percents, gas_list)
-        gas_series = gas_series.groupby(level=0).sum()  # sums duplicates
-        gas_dict = gas_series.to_dict()
-        gas_dict = {x: y for x, y in gas_dict.items() if y != 0}
-
-        # Uses create_mix method to write to gas slot 236,
-        # first custom gas slot on MFC
-        if len(gas_dict) > 1:  # if more than 1 gas, creates mix
-            try:
-                self.mfc_E.create_mix(mix_no=236, name='output',
-                                      gases=gas_dict)
-                self.mfc_E.set_gas(236)
-            except Exception as e:
-                print(e)
-                print("Passed gas dict:\n", gas_dict)
-                print("Setting output gas to ", list(gas_dict)[0])
+        with self.lock:
+            gas_list = []
+            mfc_args = {name: () for name in self.mfc_names[:4]}
+            readings = self._map_mfcs(lambda mfc: mfc.get(), mfc_args)
+            for reading in readings.values():
+                gas_name = reading['gas']
+                if gas_name.lower() == 'calgas':
+                    gas_list.append('Ar')  # Can't handle custom mixes
+                else:
+                    gas_list.append(gas_name)
+            # convert to percents, make dict, drop zero values
+            percents = np.array(comp_list, dtype=float) * 100
+            gas_series = pd.Series(percents, gas_list)
+            gas_series = gas_series.groupby(level=0).sum()  # sums duplicates
+            gas_dict = gas_series.to_dict()
+            gas_dict = {x: y for x, y in gas_dict.items() if y != 0}
+
+            # Uses create_mix method to write to gas slot 236,
+            # first custom gas slot on MFC
+            if len(gas_dict) > 1:  # if more than 1 gas, creates mix
+                try:
+                    self.mfc_E.create_mix(mix_no=236, name='output',
+                                          gases=gas_dict)
+                    self.mfc_E.set_gas(236)
+                except Exception as e:
+                    print(e)
+                    print("Passed gas dict:\n", gas_dict)
+                    print("Setting output gas to ", list(gas_dict)[0])
+                    self.mfc_E.set_gas(list(gas_dict)[0])
+            else:  # If only one gas, sets that as output
                 self.mfc_E.set_gas(list(gas_dict)[0])
-        else:  # If only one gas, sets that as output
-            self.mfc_E.set_gas(list(gas_dict)[0])
-        self.is_busy = False
 
     def check_comp_total(self, comp_list):
         """
@@ -197,21 +241,10 @@ class Gas_System:
 
     def print_flows(self):
         """Print mass flow rates and gas type for each MFC to console."""
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        print('MFC A = ' + str(self.mfc_A.get()['mass_flow'])
-              + self.mfc_A.get()['gas'])
-        print('MFC B = ' + str(self.mfc_B.get()['mass_flow'])
-              + self.mfc_B.get()['gas'])
-        print('MFC C = ' + str(self.mfc_C.get()['mass_flow'])
-              + self.mfc_C.get()['gas'])
-        print('MFC D = ' + str(self.mfc_D.get()['mass_flow'])
-              + self.mfc_D.get()['gas'])
-        print('MFC E = ' + str(self.mfc_E.get()['mass_flow'])
-              + self.mfc_E.get()['gas'])
-        self.is_busy = False
+        flow_dict = self.read_flows()
+        for name, reading in flow_dict.items():
+            print('MFC ' + name[-1] + ' = ' + str(reading['mass_flow'])
+                  + reading['gas'])
 
     def print_details(self):
         """
@@ -222,16 +255,8 @@ class Gas_System:
         None
 
         """
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        print(self.mfc_A.get())
-        print(self.mfc_B.get())
-        print(self.mfc_C.get())
-        print(self.mfc_D.get())
-        print(self.mfc_E.get())
-        self.is_busy = False
+        for reading in self.read_flows().values():
+            print(reading)
 
     def read_flows(self):
         """
@@ -242,44 +267,31 @@ class Gas_System:
         flow_dict : `dict` of `dict`
             {mfc: mfc.get()}
         """
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        flow_dict = {'mfc_A': self.mfc_A.get(),
-                     'mfc_B': self.mfc_B.get(),
-                     'mfc_C': self.mfc_C.get(),
-                     'mfc_D': self.mfc_D.get(),
-                     'mfc_E': self.mfc_E.get()}
-        self.is_busy = False
+        with self.lock:
+            flow_dict = self._map_mfcs(lambda mfc: mfc.get(),
+                                       {name: () for name in self.mfc_names})
+
         return (flow_dict)
 
     def shut_down(self):
         """Set MFC with Ar or N2 running to 1 sccm and others to 0."""
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        mfc_list = [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]
-        for mfc in mfc_list:
+        def shut_down_mfc(mfc):
             if mfc.get()['gas'] in ['Ar', 'N2']:
                 mfc.set_flow_rate(1.0)
             else:
                 mfc.set_flow_rate(0.0)
-        self.is_busy = False
+
+        with self.lock:
+            self._map_mfcs(shut_down_mfc,
+                           {name: () for name in self.mfc_names[:4]})
 
     def disconnect(self):
         """Call Gas_System.shut_down then disconnect from MFCs."""
         self.shut_down()
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        self.mfc_A.close()
-        self.mfc_B.close()
-        self.mfc_C.close()
-        self.mfc_D.close()
-        self.mfc_E.close()
-        self.is_busy = False
+        with self.lock:
+            self._map_mfcs(lambda mfc: mfc.close(),
+                           {name: () for name in self.mfc_names})
+
         del self
 
     def set_calibration_gas(self, mfc, calDF, fill_gas='Ar'):
@@ -314,12 +326,10 @@ class Gas_System:
         percents = percents[0:4]  # TODO Handle if gas list short
         percents = percents.round(2)  # High precision breaks FlowController()
         percents[fill_gas] = 100 - percents.sum()
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        print(percents.to_dict())
-        mfc.create_mix(mix_no=237, name='CalGas', gases=percents.to_dict())
-        self.is_busy = False
+        with self.lock:
+            print(percents.to_dict())
+            mfc.create_mix(mix_no=237, name='CalGas',
+                           gases=percents.to_dict())
 
     def test_pressure(self, savepath, flows, num_samples=5):
         """
@@ -1,5 +1,7 @@
 import time
 
+from catalight.equipment.device_lock import DeviceLock
+
 
 class Gas_System:
     """MFC control."""
@@ -8,6 +10,8 @@ class Gas_System:
                       'D2', 'C2H6', 'C2H4', 'He', 'H2', 'Kr', 'CH4', 'Ne',
                       'N2', 'N2O', 'O2', 'C3H8', 'SF6', 'Xe']
     """Factory gas list saved to Alicat MFCs"""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
 
     def __init__(self):
         """
@@ -31,7 +35,7 @@ class Gas_System:
 
         self.mfc_E = FlowMeter(port=cfg.mfc_list[4]['port'],
                                address=cfg.mfc_list[4]['unit'])
-        self.is_busy = False
+        self.lock = DeviceLock('Gas System')  #: Device access lock
 
     def set_gasses(self, gas_list):
         """
@@ -55,12 +59,9 @@ class Gas_System:
             if gas_list_copy[i].lower() == 'calgas':
                 gas_list_copy[i] = 237
 
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        # set gas types here
-        self.is_busy = False
+        with self.lock:
+            # set gas types here
+            pass
 
     def set_flows(self, comp_list, tot_flow):
         """
@@ -88,12 +89,9 @@ class Gas_System:
 
         """
         comp_list = self.check_comp_total(comp_list)
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        # set individual flow rate here
-        self.is_busy = False
+        with self.lock:
+            # set individual flow rate here
+            pass
 
         self.set_gasE(comp_list)
 
@@ -113,33 +111,29 @@ class Gas_System:
         """
         comp_list = self.check_comp_total(comp_list)
 
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        gas_list = []
-        for mfc in [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]:
-            gas_name = mfc.get()['gas']
-            if gas_name.lower() == 'calgas':
-                gas_list.append('Ar')  # Can't handle custom mixes
-            else:
-                gas_list.append(gas_name)
-        # convert to percents, make dict, drop zero values
-        percents = np.array(comp_list, dtype=float) * 100
-        gas_series = pd.Series(percents, gas_list)
-        gas_series = gas_series.groupby(level=0).sum()  # sums duplicates
-        gas_dict = gas_series.to_dict()
-        gas_dict = {x: y for x, y in gas_dict.items() if y != 0}
-
-        # Uses create_mix method to write to gas slot 236,
-        # first custom gas slot on MFC
-        if len(gas_dict) > 1:  # if more than 1 gas, creates mix
-            self.mfc_E.create_mix(mix_no=236, name='output',
-                                  gases=gas_dict)
-            self.mfc_E.set_gas(236)
-        else:  # If only one gas, sets that as output
-            self.mfc_E.set_gas(list(gas_dict)[0])
-        self.is_busy = False
+        with self.lock:
+            gas_list = []
+            for mfc in [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]:
+                gas_name = mfc.get()['gas']
+                if gas_name.lower() == 'calgas':
+                    gas_list.append('Ar')  # Can't handle custom mixes
+                else:
+                    gas_list.append(gas_name)
+            # convert to percents, make dict, drop zero values
+            percents = np.array(comp_list, dtype=float) * 100
+            gas_series = pd.Series(percents, gas_list)
+            gas_series = gas_series.groupby(level=0).sum()  # sums duplicates
+            gas_dict = gas_series.to_dict()
+            gas_dict = {x: y for x, y in gas_dict.items() if y != 0}
+
+            # Uses create_mix method to write to gas slot 236,
+            # first custom gas slot on MFC
+            if len(gas_dict) > 1:  # if more than 1 gas, creates mix
+                self.mfc_E.create_mix(mix_no=236, name='output',
+                                      gases=gas_dict)
+                self.mfc_E.set_gas(236)
+            else:  # If only one gas, sets that as output
+                self.mfc_E.set_gas(list(gas_dict)[0])
 
     def check_comp_total(self, comp_list):
         """
@@ -172,21 +166,17 @@ class Gas_System:
 
     def print_flows(self):
         """Print mass flow rates and gas type for each MFC to console."""
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        print('MFC A = ' + str(self.mfc_A.get()['mass_flow'])
-              + self.mfc_A.get()['gas'])
-        print('MFC B = ' + str(self.mfc_B.get()['mass_flow'])
-              + self.mfc_B.get()['gas'])
-        print('MFC C = ' + str(self.mfc_C.get()['mass_flow'])
-              + self.mfc_C.get()['gas'])
-        print('MFC D = ' + str(self.mfc_D.get()['mass_flow'])
-              + self.mfc_D.get()['gas'])
-        print('MFC E = ' + str(self.mfc_E.get()['mass_flow'])
-              + self.mfc_E.get()['gas'])
-        self.is_busy = False
+        with self.lock:
+            print('MFC A = ' + str(self.mfc_A.get()['mass_flow'])
+                  + self.mfc_A.get()['gas'])
+            print('MFC B = ' + str(self.mfc_B.get()['mass_flow'])
+                  + self.mfc_B.get()['gas'])
+            print('MFC C = ' + str(self.mfc_C.get()['mass_flow'])
+                  + self.mfc_C.get()['gas'])
+            print('MFC D = ' + str(self.mfc_D.get()['mass_flow'])
+                  + self.mfc_D.get()['gas'])
+            print('MFC E = ' + str(self.mfc_E.get()['mass_flow'])
+                  + self.mfc_E.get()['gas'])
 
     def print_details(self):
         """
@@ -197,16 +187,12 @@ class Gas_System:
         None
 
         """
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        print(self.mfc_A.get())
-        print(self.mfc_B.get())
-        print(self.mfc_C.get())
-        print(self.mfc_D.get())
-        print(self.mfc_E.get())
-        self.is_busy = False
+        with self.lock:
+            print(self.mfc_A.get())
+            print(self.mfc_B.get())
+            print(self.mfc_C.get())
+            print(self.mfc_D.get())
+            print(self.mfc_E.get())
 
     def read_flows(self):
         """
@@ -217,44 +203,35 @@ class Gas_System:
         flow_dict : `dict` of `dict`
             {mfc: mfc.get()}
         """
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        flow_dict = {'mfc_A': self.mfc_A.get(),
-                     'mfc_B': self.mfc_B.get(),
-                     'mfc_C': self.mfc_C.get(),
-                     'mfc_D': self.mfc_D.get(),
-                     'mfc_E': self.mfc_E.get()}
-        self.is_busy = False
+        with self.lock:
+            flow_dict = {'mfc_A': self.mfc_A.get(),
+                         'mfc_B': self.mfc_B.get(),
+                         'mfc_C': self.mfc_C.get(),
+                         'mfc_D': self.mfc_D.get(),
+                         'mfc_E': self.mfc_E.get()}
+
         return (flow_dict)
 
     def shut_down(self):
         """Set MFC with Ar or N2 running to 1 sccm and others to 0."""
-        while self.is_busy:
-            time.sleep(0)
-
-        self.is_busy = True
-        mfc_list = [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]
-        for mfc in mfc_list:
-            if mfc.get()['gas'] in ['Ar', 'N2']:
-                mfc.set_flow_rate(1.0)
-            else:
-                mfc.set_flow_rate(0.0)
-        self.is_busy = False
+        with self.lock:
+            mfc_list = [self.mfc_A, self.mfc_B, self.mfc_C, self.mfc_D]
+            for mfc in mfc_list:
+                if mfc.get()['gas'] in ['Ar', 'N2']:
+                    mfc.set_flow_rate(1.0)
+                else:
+                    mfc.set_flow_rate(0.0)
 
     def disconnect(self):
         """Call Gas_System.shut_down then disconnect from MFCs."""
         self.shut_down()
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        self.mfc_A.close()
-        self.mfc_B.close()
-        self.mfc_C.close()
-        self.mfc_D.close()
-        self.mfc_E.close()
-        self.is_busy = False
+        with self.lock:
+            self.mfc_A.close()
+            self.mfc_B.close()
+            self.mfc_C.close()
+            self.mfc_D.close()
+            self.mfc_E.close()
+
         del self
 
     def set_calibration_gas(self, mfc, calDF, fill_gas='Ar'):
@@ -289,12 +266,10 @@ class Gas_System:
         percents = percents[0:4]  # TODO Handle if gas list short
         percents = percents.round(2)  # High precision breaks FlowController()
         percents[fill_gas] = 100 - percents.sum()
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        print(percents.to_dict())
-        mfc.create_mix(mix_no=237, name='CalGas', gases=percents.to_dict())
-        self.is_busy = False
+        with self.lock:
+            print(percents.to_dict())
+            mfc.create_mix(mix_no=237, name='CalGas',
+                           gases=percents.to_dict())
 
     def test_pressure(self, savepath, flows, num_samples=5):
         """
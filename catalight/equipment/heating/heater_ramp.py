@@ -0,0 +1,123 @@
+"""
+Background stepping of heater setpoints.
+
+A ramp at 15 C/min to 300 C writes a new setpoint every few seconds for about
+20 minutes. :class:`HeaterRamp` does this on its own thread so the caller can
+set up other equipment while the reactor heats, then wait for
+:attr:`HeaterRamp.finished` when the temperature is needed.
+
+Example
+-------
+>>> ramp = heater.start_ramp(300)
+>>> gas_controller.set_flows(comp_list, tot_flow)
+>>> ramp.wait()
+"""
+import threading
+import time
+
+
+class HeaterRamp():
+    """
+    Handle of a ramp writing setpoints to a heater on a background thread.
+
+    Usually created by Heater.start_ramp rather than directly.
+
+    Parameters
+    ----------
+    setpoints : list[float] or numpy.ndarray
+        (C) Setpoints to write in order.
+    interval : float
+        (s) Time between writing setpoints.
+    write_func : callable
+        Function writing one setpoint (C) to the heater.
+    record_func : `callable`, optional
+        Function returning [set point, temperature] recorded before each
+        write into :attr:`read_out`. The default is None (no record).
+    """
+
+    def __init__(self, setpoints, interval, write_func, record_func=None):
+        self.setpoints = setpoints
+        """(C) Setpoints written during the ramp"""
+        self.interval = interval
+        """(s) Time between writing setpoints"""
+        self.read_out = []
+        """List of [time, set point, temperature] when recording"""
+        self.finished = threading.Event()
+        """Set once the ramp completes, is cancelled, or fails"""
+        self.error = None
+        """Exception that stopped the ramp or None"""
+        self._write_func = write_func
+        self._record_func = record_func
+        self._step = 0  # Number of setpoints written
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def progress(self):
+        """float: Fraction of setpoints written, 0 to 1, read-only."""
+        if len(self.setpoints) == 0:
+            return 1.0
+        return self._step / len(self.setpoints)
+
+    @property
+    def setpoint(self):
+        """float or None: (C) Last setpoint written, read-only."""
+        return self.setpoints[self._step - 1] if self._step else None
+
+    @property
+    def cancelled(self):
+        """bool: True if :meth:`cancel` was called, read-only."""
+        return self._cancel_event.is_set()
+
+    def start(self):
+        """Start writing setpoints on a background thread."""
+        self._thread.start()
+
+    def done(self):
+        """Return True if the ramp is no longer running."""
+        return self.finished.is_set()
+
+    def cancel(self):
+        """Stop the ramp after the setpoint currently being written."""
+        self._cancel_event.set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the ramp to finish.
+
+        Parameters
+        ----------
+        timeout : `float`, optional
+            (s) Maximum time to wait. The default is None (wait until done).
+
+        Returns
+        -------
+        bool
+            True if the ramp finished, False if timeout passed first.
+
+        Raises
+        ------
+        Exception
+            The error raised while writing setpoints, if any.
+        """
+        finished = self.finished.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return finished
+
+    def _run(self):
+        """Write each setpoint then sleep interval until done or cancelled."""
+        try:
+            for temp in self.setpoints:
+                if self._cancel_event.is_set():
+                    break
+                if self._record_func is not None:
+                    self.read_out.append([time.time(), *self._record_func()])
+                self._write_func(temp)
+                self._step += 1
+                self._cancel_event.wait(self.interval)
+        except Exception as e:
+            print('Heater ramp failed:', e)
+            self.error = e
+        finally:
+            self.finished.set()
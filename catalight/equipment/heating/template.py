@@ -13,6 +13,9 @@ import numpy as np
 import pandas as pd
 from pywatlow.watlow import Watlow
 
+from catalight.equipment.device_lock import DeviceLock
+from catalight.equipment.heating.heater_ramp import HeaterRamp
+
 
 def convert_temp(old_unit, new_unit, temp):
     """
@@ -54,6 +57,11 @@ class Heater:
     max_temp = 450
     """int or float: Max temp in C; 450C reduces lifetime 900C is real max.
     To change, use Heater.max_temp = new_value"""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
+    is_ramping = property(lambda self: (self._ramp is not None
+                                        and not self._ramp.done()))
+    """bool: True while a ramp started by start_ramp is running, read-only."""
 
     def __init__(self):
         """Connect to watlow, print current state."""
@@ -62,11 +70,12 @@ class Heater:
         self.controller = Watlow(port='COM5', address=1)
         # ---------------------------------------------------------------------
 
-        self.is_busy = False  #: Used to block access from other threads
+        self.lock = DeviceLock('Heater')  #: Device access lock
         print('Heater Initializing...')
         print('Current temperature = ' + str(self.read_temp()) + ' C')
         print('Current setpoint = ' + str(self.read_setpoint()) + ' C')
         self.ramp_rate = 15  #: C/min used for ramp method
+        self._ramp = None  # HeaterRamp of the latest ramp
         # TODO put check on heat rate
 
     def read_temp(self, temp_units='C'):
@@ -84,16 +93,11 @@ class Heater:
             Current temperature in requested units.
 
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO: Update to device specific
-        temp = self.controller.read()['data']
-        # ---------------------------------------------------------------------
-
-        self.is_busy = False
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO: Update to device specific
+            temp = self.controller.read()['data']
+            # -----------------------------------------------------------------
 
         if temp_units.upper() != 'F':
             temp = convert_temp('F', temp_units, temp)
@@ -115,16 +119,11 @@ class Heater:
             Current setpoint in requested units, rounded to 3 digits.
 
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO: Update to device specific
-        setpoint = self.controller.readSetpoint()['data']
-        # ---------------------------------------------------------------------
-
-        self.is_busy = False
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO: Update to device specific
+            setpoint = self.controller.readSetpoint()['data']
+            # -----------------------------------------------------------------
 
         if temp_units.upper() != 'F':
             setpoint = convert_temp('F', temp_units, setpoint)
@@ -132,37 +131,30 @@ class Heater:
         return round(setpoint, 3)
 
     def shut_down(self):
-        """Set heater to 0 F."""
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO: Update to device specific command to set to 0
-        self.controller.write(0)
-        # ---------------------------------------------------------------------
-
-        self.is_busy = False
+        """Stop any running ramp and set heater to 0 F."""
+        self.stop_ramp()
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO: Update to device specific command to set to 0
+            self.controller.write(0)
+            # -----------------------------------------------------------------
 
     def disconnect(self):
         """Run shut_down() and then close connection."""
         self.shut_down()
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO: Update to device specific connection sever!
-        self.controller.close()
-        # ---------------------------------------------------------------------
-
-        self.is_busy = False
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO: Update to device specific connection sever!
+            self.controller.close()
+            # -----------------------------------------------------------------
 
     def ramp(self, T2, T1=None, temp_units='C', record=False):
         """
         Ramp the heater from T1 to T2 at ramp rate defined by instance attr.
 
-        If record=True, records the time, setpoint, and temp. Plots outcome.
+        Blocks until the ramp is finished. Use :meth:`start_ramp` to ramp in
+        the background. If record=True, records the time, setpoint, and temp.
+        Plots outcome.
 
         Parameters
         ----------
@@ -187,6 +179,53 @@ class Heater:
         matplotlib.pyplot.axis, when record=True
             axis handle for ramp rate plot
         """
+        ramp = self.start_ramp(T2, T1, temp_units, record)
+        try:
+            ramp.wait()
+        except KeyboardInterrupt:
+            ramp.cancel()  # Don't keep stepping setpoints after interrupt
+            raise
+
+        print('Soak Temp = ' + str(self.read_temp()))
+
+        if record:  # Record and return output
+            read_out = pd.DataFrame(ramp.read_out, columns=['time',
+                                                            'set point',
+                                                            'temperature'])
+            read_out['time'] = (read_out['time'] - read_out['time'][0]) / 60
+            ax = read_out.plot(x='time')
+            ax.set_xlabel('time [min]')
+            ax.set_ylabel('Temperature [$\degree$C]')
+            ax.set_title('Ramp rate = ' + str(self.ramp_rate))
+            return (read_out, ax.get_figure(), ax)
+        else:
+            return
+
+    def start_ramp(self, T2, T1=None, temp_units='C', record=False):
+        """
+        Start ramping the heater from T1 to T2 on a background thread.
+
+        Setpoints are stepped at the ramp rate defined by instance attr while
+        the caller continues. Any ramp already running is cancelled first.
+
+        Parameters
+        ----------
+        T2 : float
+            Target setpoint
+        T1 : float
+            Starting setpoint Uses the last setpoint if None. None is default.
+        temp_units : str
+            C, K, or F. The default is 'C'.
+        record : bool
+            If True, records the time, setpoint, and temp before each step in
+            read_out of the returned ramp.
+
+        Returns
+        -------
+        HeaterRamp
+            Handle with progress, finished event, wait(), and cancel().
+        """
+        self.stop_ramp()
         if T1 is None:
             T1 = self.read_setpoint(temp_units)
 
@@ -206,39 +245,29 @@ class Heater:
         refresh_rate = 20  # 1/min
         ramp_time = (T2 - T1) / self.ramp_rate  # min
         setpoints = np.linspace(T1, T2, abs(int(ramp_time * refresh_rate)))
-        read_out = []
-        for temp in setpoints:
-            temp = convert_temp('C', 'F', temp)  # Change units to F
-            if record:
-                read_out.append([time.time(),
-                                 self.read_setpoint(),
-                                 self.read_temp()])
-            while self.is_busy:
-                time.sleep(0)
-            self.is_busy = True
-
+        record_func = None
+        if record:
+            def record_func():
+                return [self.read_setpoint(), self.read_temp()]
+        self._ramp = HeaterRamp(setpoints, 60 / refresh_rate,
+                                self._write_setpoint, record_func)
+        self._ramp.start()
+        return self._ramp
+
+    def stop_ramp(self):
+        """Cancel the running ramp, if any, and wait for it to stop."""
+        if self._ramp is not None:
+            self._ramp.cancel()
+            self._ramp.finished.wait()
+
+    def _write_setpoint(self, temp):
+        """Write setpoint in C to the controller."""
+        with self.lock:
             # -----------------------------------------------------------------
             # TODO: Update to device specific command!!
-            self.controller.write(temp)  # write to controller
+            self.controller.write(convert_temp('C', 'F', temp))
             # -----------------------------------------------------------------
 
-            self.is_busy = False
-            time.sleep(60 / refresh_rate)  # wait
-
-        print('Soak Temp = ' + str(self.read_temp()))
-
-        if record:  # Record and return output
-            read_out = pd.DataFrame(read_out, columns=['time', 'set point',
-                                                       'temperature'])
-            read_out['time'] = (read_out['time'] - read_out['time'][0]) / 60
-            ax = read_out.plot(x='time')
-            ax.set_xlabel('time [min]')
-            ax.set_ylabel('Temperature [$\degree$C]')
-            ax.set_title('Ramp rate = ' + str(self.ramp_rate))
-            return (read_out, ax.get_figure(), ax)
-        else:
-            return
-
     def test_heater_performance(self, savepath, rates, T_max, T_min=30):
         """
         Loops through provided ramp rates, ramps heater, save outcomes.
@@ -4,7 +4,6 @@ import os
 import re
 import time
 from ctypes import POINTER, cast
-from threading import Timer
 
 import numpy as np
 import pyttsx3
@@ -13,6 +12,9 @@ from mcculw import ul
 from mcculw.device_info import DaqDeviceInfo
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 
+from catalight.equipment.data_logger import EquipmentLogger
+from catalight.equipment.device_lock import DeviceLock
+
 # Sets path when file is imported
 package_dir = os.path.dirname(os.path.abspath(__file__))
 calibration_path = os.path.join(package_dir, 'diode_calibration.txt')
@@ -31,10 +33,12 @@ class Diode_Laser():
     """
     is_tunable = False
     """bool: Defines whether laser class is tunable. Diode is not."""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
 
     def __init__(self):
         # Set public attr
-        self.is_busy = False  #: Used to block access from multiple threads
+        self.lock = DeviceLock('Diode laser')  #: Device access lock
         self.board_num = 0  #: Location of DAQ in "instacal" software.
         self.memhandle = None
         self.channel = 0
@@ -147,34 +151,32 @@ class Diode_Laser():
         if P_set != 0:
             print('ramp time = %6.4f minutes' % ramp_time)
 
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        for I in setpoints: # noqa I==current
-            # Ramps the current slowly
-            Vout = I / self._k_mod  # (V) Voltage output set point
-            if (P_set == 0) and self._ao_info.is_supported:
-                Vout = 0
-                # Convert to 16bit
-                Vout_value = ul.from_eng_units(self.board_num, self._ao_range, Vout)
-                # Send signal to DAQ Board
-                ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
-                break
-
-            elif (P_set != 0) and self._ao_info.is_supported:
-                # Convert to 16bit
-                Vout_value = ul.from_eng_units(self.board_num, self._ao_range, Vout)
-                # Send signal to DAQ Board
-                ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
-                time.sleep(60 / refresh_rate)  # wait
-                self._P_set = self.I_to_P(I)
-                print('Set Point = %7.2f mW / %7.2f mA' % (self.P_set, I))
-
-            else:
-                print('DAQ Write Not Supported')
+        with self.lock:
+            for I in setpoints: # noqa I==current
+                # Ramps the current slowly
+                Vout = I / self._k_mod  # (V) Voltage output set point
+                if (P_set == 0) and self._ao_info.is_supported:
+                    Vout = 0
+                    # Convert to 16bit
+                    Vout_value = ul.from_eng_units(self.board_num,
+                                                   self._ao_range, Vout)
+                    # Send signal to DAQ Board
+                    ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
+                    break
+
+                elif (P_set != 0) and self._ao_info.is_supported:
+                    # Convert to 16bit
+                    Vout_value = ul.from_eng_units(self.board_num,
+                                                   self._ao_range, Vout)
+                    # Send signal to DAQ Board
+                    ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
+                    time.sleep(60 / refresh_rate)  # wait
+                    self._P_set = self.I_to_P(I)
+                    print('Set Point = %7.2f mW / %7.2f mA' % (self.P_set, I))
+
+                else:
+                    print('DAQ Write Not Supported')
 
-        self.is_busy = False
         self._P_set = P_set
         print('\n', time.ctime())
         self.print_output()
@@ -190,23 +192,20 @@ class Diode_Laser():
             Current measured by DAQ
 
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        if self._ai_info.is_supported:
-            # Get input value into DAQ
-            Vin_value = ul.a_in(self.board_num, self.channel, self._ai_range)
-            Vin_eng_units_value = ul.to_eng_units(self.board_num,
-                                                  self._ai_range, Vin_value)
-            # Convert to relevant output numbers
-            V = Vin_eng_units_value
-            I = round(V * self._k_mod, 3)  # noqa I==current
-        else:
-            print('DAQ Read Not Supported')
-            I = 0  # noqa I==current
+        with self.lock:
+            if self._ai_info.is_supported:
+                # Get input value into DAQ
+                Vin_value = ul.a_in(self.board_num, self.channel,
+                                    self._ai_range)
+                Vin_eng_units_value = ul.to_eng_units(
+                    self.board_num, self._ai_range, Vin_value)
+                # Convert to relevant output numbers
+                V = Vin_eng_units_value
+                I = round(V * self._k_mod, 3)  # noqa I==current
+            else:
+                print('DAQ Read Not Supported')
+                I = 0  # noqa I==current
 
-        self.is_busy = False
         return (abs(I))
 
     def get_output_power(self):
@@ -270,15 +269,13 @@ class Diode_Laser():
 
     def shut_down(self):
         """Set power of laser to 0 by setting DAQ Voltage to 0."""
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        Vout = 0  # (V) Voltage output set point
-        # Convert to 16bit
-        Vout_value = ul.from_eng_units(self.board_num, self._ao_range, Vout)
-        # Send signal to DAQ Board
-        ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
-        self.is_busy = False
+        with self.lock:
+            Vout = 0  # (V) Voltage output set point
+            # Convert to 16bit
+            Vout_value = ul.from_eng_units(self.board_num,
+                                           self._ao_range, Vout)
+            # Send signal to DAQ Board
+            ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
 
     def update_calibration(self, slope, intercept):
         """
@@ -354,18 +351,16 @@ class Diode_Laser():
         """
         Vout = I_set / self._k_mod  # (V) Voltage output set point
         print('Current set to %.2f\nVoltage set to %.2f' % (I_set, Vout))
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        # Convert to 16bit
-        Vout_value = ul.from_eng_units(self.board_num, self._ao_range, Vout)
-
-        # Send signal to DAQ Board
-        ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
-        Vin_value = ul.a_in(self.board_num, self.channel, self._ai_range)
-        Vin_eng_units_value = ul.to_eng_units(self.board_num,
-                                              self._ai_range, Vin_value)
-        self.is_busy = False
+        with self.lock:
+            # Convert to 16bit
+            Vout_value = ul.from_eng_units(self.board_num,
+                                           self._ao_range, Vout)
+
+            # Send signal to DAQ Board
+            ul.a_out(self.board_num, 0, self._ao_range, Vout_value)
+            Vin_value = ul.a_in(self.board_num, self.channel, self._ai_range)
+            Vin_eng_units_value = ul.to_eng_units(self.board_num,
+                                                  self._ai_range, Vin_value)
 
         self.print_output()
         print(time.ctime())
@@ -379,8 +374,10 @@ class Diode_Laser():
         """
         Start the data log function to record the laser set point.
 
-        Records constantly until stop_logger() is called. Creates self.timer
-        and self.save_path when called.
+        Records constantly until stop_logger() is called. Creates self.logger
+        and self.save_path when called. Readings are buffered and written to
+        file in batches by an
+        :class:`~catalight.equipment.data_logger.EquipmentLogger`.
 
         Parameters
         ----------
@@ -388,63 +385,36 @@ class Diode_Laser():
             (seconds) interval to record data with. The default is 0.1 sec.
         save_path : `str`, optional
             Full tile path to save data to. If None, saves in module directory
-            with file name 'YYYYMMDDlaser_log.txt'. Appends int to end of file
+            with file name 'YYYYMMDDlaser_log.csv'. Appends int to end of file
             name if file name already exists.
         """
         if save_path is None:  # if savepath is unspecified, saves in cwd
             save_path = os.path.join(os.getcwd(),
-                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.txt')
+                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.csv')
         while os.path.isfile(save_path):  # check if log w/ default name exists
             m = 1
-            save_path = save_path.removesuffix('.txt')
+            save_path, ext = os.path.splitext(save_path)
             # checks if save_path has number at end
             if re.findall(r'\d+$', save_path):
                 m += int(re.findall(r'\d+$', save_path)[-1])
-            # append number and .txt to filename,
+            # append number and extension to filename,
             # then check if name still exists
             save_path = re.split(r'\d+$', save_path)[0] + str(m)
-            save_path = save_path + '.txt'
+            save_path = save_path + ext
 
         self.save_path = save_path  # assign local pathname to class attribute
-        # create update thread
-        self.timer = RepeatTimer(log_frequency, self.log_power)
-        self.timer.start()
-
-    def log_power(self):
-        """Append (date and current power setpoint) to the log at save_path."""
-        with open(self.save_path, 'a') as output_log:
-            entry = ('%s, %6.2f \n' % (dt.datetime.now(), self.P_set))
-            output_log.write(entry)
+        # Columns are time and P_set
+        self.logger = EquipmentLogger(save_path, interval=log_frequency)
+        self.logger.add_device('P_set', lambda: self.P_set)
+        self.logger.start()
 
     def stop_logger(self):
-        """Cancel timer initialized w/ start_logger() and delete it."""
-        if self.timer:
-            self.timer.cancel()
-            del self.timer
+        """Stop logger started w/ start_logger(), save data, and delete it."""
+        if getattr(self, 'logger', None):
+            self.logger.stop()
+            del self.logger
         else:
-            print('No Timer')
-
-
-class RepeatTimer(Timer):
-    """
-    Subclass of threading.Timer. Runs at interval until cancelled.
-
-    Parameters
-    ----------
-    interval : float or int
-        Time interval in seconds to call function.
-    function : `function`
-        Functions to call
-    args
-        Arguments of function.
-    kwargs
-        Key word arguments of function.
-    """
-
-    def run(self):
-        """Run function until finished supplying args and kwargs."""
-        while not self.finished.wait(self.interval):
-            self.function(*self.args, **self.kwargs)
+            print('No Logger')
 
 
 if __name__ == "__main__":
@@ -15,8 +15,8 @@ from scipy.optimize import curve_fit
 
 from catalight.cl_tools import printProgressBar
 from catalight.analysis.plotting import set_plot_style
-from catalight.equipment.light_sources.nkt_helper_funcs import (predict_power,
-                                                                determine_setpoint)
+from catalight.equipment.light_sources.nkt_helper_funcs import (
+    NKTCalibration, predict_power, determine_setpoint)
 
 
 def correction_model(x, a):
@@ -181,24 +181,26 @@ def determine_fits(corrected_data, deg=2):
 
     Returns
     -------
-    pandas.DataFrame
-        Fit parameters for each wavelength.
-        Index is wavelength.
-        Columns are [fit params, relative error, covariance matrix]
-        Each item within the DataFrame is a list itself.
+    NKTCalibration
+        Fit parameters and their covariance for each wavelength.
     """
     print('Computing Calibration...')
-    params_df = pd.DataFrame(columns=['fit params', 'relative error',
-                                      'covariance matrix'],
-                             index=corrected_data.index)
-    for index, row in corrected_data.iterrows():
-        y = row.values
-        x = row.index.astype(float)
-        p, V = np.polyfit(x, y, deg=deg, cov=True)
-        std_dev = np.sqrt(V.diagonal())
-        rel_error = std_dev/p
-        params_df.loc[index] = [p, rel_error, V]
-    return params_df
+    # All wavelengths share the same setpoints, so one Vandermonde matrix
+    # solves every wavelength's least squares problem at once
+    x = corrected_data.columns.astype(float).values
+    y = corrected_data.values.T  # (setpoints x wavelengths)
+    lhs = np.vander(x, deg + 1)
+    scale = np.sqrt((lhs * lhs).sum(axis=0))  # Scale columns like np.polyfit
+    lhs_scaled = lhs / scale
+    coefficients, _, _, _ = np.linalg.lstsq(lhs_scaled, y, rcond=None)
+    coefficients = coefficients.T / scale  # (wavelengths x deg + 1)
+    # Covariance scaled by residuals, same as np.polyfit(..., cov=True)
+    resids = ((lhs @ coefficients.T - y)**2).sum(axis=0)
+    Vbase = np.linalg.inv(lhs_scaled.T @ lhs_scaled)
+    Vbase /= np.outer(scale, scale)
+    fac = resids / (len(x) - (deg + 1))
+    covariance = Vbase[np.newaxis, :, :] * fac[:, np.newaxis, np.newaxis]
+    return NKTCalibration(corrected_data.index, coefficients, covariance)
 
 
 def plot_fits(calibration_data, calibration, savedata=False):
@@ -210,11 +212,8 @@ def plot_fits(calibration_data, calibration, savedata=False):
     calibration_data :  pandas.DataFrame
         Raw calibration data for NKT system.
         Index is wavelength and headers are NKT power setpoint in %.
-    calibration : pandas.DataFrame
+    calibration : NKTCalibration
         Calibration fits for nkt_laser system.
-        Fit parameters for each wavelength. Index is wavelength.
-        Columns are [fit params, relative error, covariance matrix]
-        Each item within the DataFrame is a list itself.
     savedata : `bool`, optional
         Indicate whether to save results, by default False
     """
@@ -237,7 +236,9 @@ def plot_fits(calibration_data, calibration, savedata=False):
         lines = ax.get_lines()
         last_line_color = lines[-1].get_color()
         x_fit = np.arange(0, 100, 1)
-        y_fit = np.polyval(calibration['fit params'][center], x_fit)
+        fit_params = calibration.coefficients[
+            np.searchsorted(calibration.wavelengths, center)]
+        y_fit = np.polyval(fit_params, x_fit)
         ax.plot(x_fit, y_fit, '--', color=last_line_color)
         ax.set_title(str(center), loc='left', y=1, x=0.05,
                      pad=-14, fontsize=12)
@@ -263,11 +264,8 @@ def benchmark(calibration, savedata=False):
 
     Parameters
     ----------
-    calibration : pandas.DataFrame
+    calibration : NKTCalibration
         Calibration fits for nkt_laser system.
-        Fit parameters for each wavelength. Index is wavelength.
-        Columns are [fit params, relative error, covariance matrix]
-        Each item within the DataFrame is a list itself.
     savedata : `bool`, optional
         Indicate whether to save results, by default False
     """
@@ -449,7 +447,7 @@ def main():
     calibration = determine_fits(corrected_data)
     plot_fits(cal_data, calibration, savedata=True)
     benchmark(calibration, savedata=True)
-    calibration.to_pickle(os.path.join(folder, 'nkt_calibration.pkl'))
+    calibration.save(os.path.join(folder, 'nkt_calibration.npz'))
 
 
 if __name__ == '__main__':
@@ -465,5 +463,5 @@ if __name__ == '__main__':
     plot_fits(cal_data, calibration, savedata=True)
     benchmark(calibration, savedata=True)
     folder = os.path.dirname(cal_path)
-    calibration.to_pickle(os.path.join(folder, 'nkt_calibration.pkl'))
+    calibration.save(os.path.join(folder, 'nkt_calibration.npz'))
     plt.show()
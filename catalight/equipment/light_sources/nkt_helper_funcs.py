@@ -1,8 +1,178 @@
 import numpy as np
-import pandas as pd
 import warnings
 
 
+class NKTCalibration():
+    """
+    Calibration fits of the NKT system stored as dense arrays.
+
+    The fit parameters of every wavelength are stored in one coefficient
+    array together with their cumulative sum, so the summed polynomial of any
+    bandpass window takes two index lookups. Summed polynomials are cached per
+    (center, bandwidth), which makes repeated predictions and setpoint solves
+    for the same bandpass effectively free. Calibrations are saved as .npz
+    files holding only numeric arrays.
+
+    Parameters
+    ----------
+    wavelengths : array_like
+        [nm] Wavelengths of the calibration, sorted ascending.
+    coefficients : array_like
+        Polynomial fit parameters, one row per wavelength, highest power first
+        (same order as numpy.polyfit).
+    covariance : `array_like`, optional
+        Covariance matrix of the fit parameters of each wavelength, shape
+        (num wavelengths, degree + 1, degree + 1). The default is None.
+    """
+
+    file_version = 1
+    """int: Version number written to saved calibration files."""
+
+    def __init__(self, wavelengths, coefficients, covariance=None):
+        self.wavelengths = np.asarray(wavelengths, dtype=float)
+        """[nm] Wavelengths of the calibration"""
+        self.coefficients = np.ascontiguousarray(coefficients, dtype=float)
+        """Fit parameters, shape (num wavelengths, degree + 1)"""
+        self.covariance = (None if covariance is None
+                           else np.ascontiguousarray(covariance, dtype=float))
+        """Covariance of fit parameters, one matrix per wavelength, or None"""
+        # Row i is the sum of the first i rows of coefficients
+        self._cumulative = np.zeros((len(self.wavelengths) + 1,
+                                     self.coefficients.shape[1]))
+        np.cumsum(self.coefficients, axis=0, out=self._cumulative[1:])
+        self._window_cache = {}
+
+    @property
+    def relative_error(self):
+        """Standard deviation / value of each fit parameter, or None"""
+        if self.covariance is None:
+            return None
+        std_dev = np.sqrt(np.diagonal(self.covariance, axis1=1, axis2=2))
+        return std_dev / self.coefficients
+
+    @classmethod
+    def from_frame(cls, calibration):
+        """
+        Convert a legacy calibration DataFrame (nkt_calibration.pkl).
+
+        Parameters
+        ----------
+        calibration : pandas.DataFrame
+            Calibration fits for nkt_laser system. Index is wavelength.
+            Columns are [fit params, relative error, covariance matrix]
+            Each item within the DataFrame is a list itself.
+
+        Returns
+        -------
+        NKTCalibration
+            Calibration with the same fits.
+        """
+        calibration = calibration.sort_index()
+        return cls(calibration.index, calibration['fit params'].to_list(),
+                   calibration['covariance matrix'].to_list())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a calibration saved with :meth:`save`.
+
+        Parameters
+        ----------
+        path : str
+            Full path to .npz calibration file.
+
+        Returns
+        -------
+        NKTCalibration
+            Loaded calibration.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version > cls.file_version:
+                raise ValueError('Calibration file version %i is newer than '
+                                 'supported version %i'
+                                 % (version, cls.file_version))
+            covariance = data['covariance'] if 'covariance' in data else None
+            return cls(data['wavelengths'], data['coefficients'], covariance)
+
+    def save(self, path):
+        """
+        Save calibration as an uncompressed .npz file.
+
+        Parameters
+        ----------
+        path : str
+            Full path to save calibration to, should end in .npz
+        """
+        arrays = {'version': np.array(self.file_version),
+                  'wavelengths': self.wavelengths,
+                  'coefficients': self.coefficients}
+        if self.covariance is not None:
+            arrays['covariance'] = self.covariance
+        np.savez(path, **arrays)
+
+    def window_coefficients(self, center, bandwidth):
+        """
+        Return the polynomial giving total power through a bandpass window.
+
+        Sums the fit parameters of all wavelengths in
+        (center - bandwidth/2, center + bandwidth/2]. Windows holding fewer
+        than bandwidth wavelengths are padded with the first calibration
+        wavelength when the window starts there, otherwise with the last
+        wavelength in the window.
+
+        Parameters
+        ----------
+        center : float or int or numpy.ndarray
+            The central wavelength(s) of the laser.
+        bandwidth : float or int
+            The bandwidth setting for the laser.
+
+        Returns
+        -------
+        numpy.ndarray
+            Polynomial coefficients, highest power first. Has one row per
+            center if an array of centers was given.
+        """
+        if np.ndim(center) == 0:
+            key = (float(center), float(bandwidth))
+            if key not in self._window_cache:
+                self._window_cache[key] = self._window_sums(
+                    np.array([center]), bandwidth)[0]
+            return self._window_cache[key]
+        return self._window_sums(np.asarray(center, dtype=float), bandwidth)
+
+    def _window_sums(self, centers, bandwidth):
+        """Sum fit parameters for each center in a 1D array of centers."""
+        start = np.searchsorted(self.wavelengths, centers - bandwidth/2,
+                                side='right')
+        stop = np.searchsorted(self.wavelengths, centers + bandwidth/2,
+                               side='right')
+        sums = self._cumulative[stop] - self._cumulative[start]
+        num_pad = np.maximum(np.ceil(bandwidth) - (stop - start), 0)
+        pad_row = np.where(start == 0, 0, np.maximum(stop - 1, 0))
+        return sums + num_pad[:, np.newaxis] * self.coefficients[pad_row]
+
+
+def compile_calibration(calibration):
+    """
+    Return calibration as an NKTCalibration, compiling it if needed.
+
+    Parameters
+    ----------
+    calibration : NKTCalibration or pandas.DataFrame
+        Calibration fits for nkt_laser system, legacy DataFrames are converted.
+
+    Returns
+    -------
+    NKTCalibration
+        Compiled calibration. Returned unchanged if already compiled.
+    """
+    if isinstance(calibration, NKTCalibration):
+        return calibration
+    return NKTCalibration.from_frame(calibration)
+
+
 def predict_power(calibration, power_setpoint, center, bandwidth):
     """
     Determine the power output (mW) expected from the given laser conditions.
@@ -12,11 +182,10 @@ def predict_power(calibration, power_setpoint, center, bandwidth):
 
     Parameters
     ----------
-    calibration : pandas.DataFrame
-        Calibration fits for nkt_laser system.
-        Fit parameters for each wavelength. Index is wavelength.
-        Columns are [fit params, relative error, covariance matrix]
-        Each item within the DataFrame is a list itself.
+    calibration : NKTCalibration or pandas.DataFrame
+        Calibration fits for nkt_laser system. Legacy DataFrames are
+        converted on every call, pass an NKTCalibration when calling
+        repeatedly.
     power_setpoint: int or float or list[float]
         The power setpoint (in %) the user desires. This can also be supplied
         as a pandas.DataFrame or numpy.array.
@@ -30,31 +199,10 @@ def predict_power(calibration, power_setpoint, center, bandwidth):
     float
         The power output (in mW) expected from the given setpoint.
     """
-    mask = ((calibration.index > center - bandwidth/2)
-            & (calibration.index <= center + bandwidth/2))
-    roi = calibration[mask]
-    #print(roi)
-    # Duplicate the first row until the desired size is reached
-    while len(roi) < bandwidth:
-        if roi.index[0] == calibration.index[0]:
-            roi = pd.concat([roi, roi.iloc[0:1]], ignore_index=True)
-        else:
-            roi = pd.concat([roi, roi.iloc[-1:]], ignore_index=True)
-    p = np.array(roi['fit params'].to_list())
-    V = roi['covariance matrix']
-    degree = p.shape[1]-1
-    x = power_setpoint  # The x values for interpolation
-    powers = np.arange(degree, -1, -1)  # The power to raise x to [x^2, x^1...]
-    # If x [a, b, c, d...] is an array,
-    # we want to raise each value to each power [n, n-1, ... 2, 1, 0]
-    # [[a^2, a^1, a^0],
-    #  [b^2, b^1, b^0],
-    #     ...
-    #  [d^2, d^1, d^0]]
-    x_powers = np.power.outer(x, powers)
-    y = p @ x_powers.T
-    prediction = y.sum(axis=0)
-    # x_error = np.sqrt(x_powers.dot(V).dot(x_powers))
+    p = compile_calibration(calibration).window_coefficients(center,
+                                                             bandwidth)
+    # Evaluate summed polynomial of every wavelength in the bandpass
+    prediction = np.polyval(p, power_setpoint)
     return prediction
 
 
@@ -62,17 +210,17 @@ def determine_setpoint(calibration, power_requested, center, bandwidth):
     """
     Determine the power setpoint (%) needed to reach a certain output power.
 
-    Predicts the power output of the NKT over the full range of power
-    setpoints [12% - 100%]. Returns the power setpoint that should produce the
-    power output closest to the user supplied power_requested parameter.
+    Solves the summed calibration polynomial of the bandpass for the power
+    setpoint range [12% - 100%]. Returns the power setpoint, on a 0.1% grid,
+    that should produce the power output closest to the user supplied
+    power_requested parameter.
 
     Parameters
     ----------
-    calibration : pandas.DataFrame
-        Calibration fits for nkt_laser system.
-        Fit parameters for each wavelength. Index is wavelength.
-        Columns are [fit params, relative error, covariance matrix]
-        Each item within the DataFrame is a list itself.
+    calibration : NKTCalibration or pandas.DataFrame
+        Calibration fits for nkt_laser system. Legacy DataFrames are
+        converted on every call, pass an NKTCalibration when calling
+        repeatedly.
     power_requested: int or float
         The power setpoint (in mW) the user desires.
     center : float or int
@@ -88,9 +236,19 @@ def determine_setpoint(calibration, power_requested, center, bandwidth):
     """
     if power_requested == 0:
         return 0
-    
-    setpoints = np.arange(12, 100.1, 0.1)
-    values = predict_power(calibration, setpoints, center, bandwidth)
+
+    p = compile_calibration(calibration).window_coefficients(center,
+                                                             bandwidth)
+    # The closest setpoint on the 0.1% grid is next to a solution of
+    # P(x) = power_requested, next to a turning point of P(x), or at a limit
+    roots = np.concatenate([np.roots(np.polysub(p, [power_requested])),
+                            np.roots(np.polyder(p))])
+    roots = roots[np.isreal(roots)].real
+    steps = np.floor((roots - 12) * 10)
+    steps = np.concatenate([[0, 880], steps, steps + 1])
+    steps = np.unique(np.clip(steps, 0, 880))
+    setpoints = 12 + steps / 10
+    values = np.polyval(p, setpoints)
     optimal_index = np.abs(values-power_requested).argmin()
     optimal_setpoint = setpoints[optimal_index]
     optimal_value = values[optimal_index]
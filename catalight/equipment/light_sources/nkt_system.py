@@ -9,7 +9,6 @@ import re
 import time
 import datetime as dt
 from ctypes import POINTER, cast
-from threading import Timer
 
 import numpy as np
 import pandas as pd
@@ -23,13 +22,16 @@ from catalight.equipment.light_sources import (nkt_collect_calibration,
                                                nkt_verify_calibration)
 
 import catalight.equipment.light_sources as optics_tools
-from catalight.equipment.light_sources.nkt_helper_funcs import (predict_power,
-                                                                determine_setpoint)
+from catalight.equipment.data_logger import EquipmentLogger
+from catalight.equipment.device_lock import DeviceLock
+from catalight.equipment.light_sources.nkt_helper_funcs import (
+    NKTCalibration, predict_power, determine_setpoint)
 
 
 # Sets path when file is imported
 package_dir = os.path.dirname(os.path.abspath(__file__))
-calibration_path = os.path.join(package_dir, 'nkt_calibration.pkl')
+calibration_path = os.path.join(package_dir, 'nkt_calibration.npz')
+legacy_calibration_path = os.path.join(package_dir, 'nkt_calibration.pkl')
 
 
 class NKT_System():
@@ -44,10 +46,12 @@ class NKT_System():
     """
     is_tunable = True
     """bool: Defines whether laser class is tunable. NKT system is."""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
 
     def __init__(self):
         # Set public attr
-        self.is_busy = False  #: Used to block access from multiple threads
+        self.lock = DeviceLock('NKT system')  #: Device access lock
 
         # Set non-public attr
         self._calibration = [0, 0]
@@ -87,14 +91,10 @@ class NKT_System():
 
         Set with set_bandpass()
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
+        with self.lock:
+            self._central_wavelength = (self._bandpass.long_setpoint
+                                        + self._bandpass.short_setpoint)/2
 
-        self._central_wavelength = (self._bandpass.long_setpoint
-                                    + self._bandpass.short_setpoint)/2
-
-        self.is_busy = False
         return self._central_wavelength
 
     @property
@@ -104,14 +104,10 @@ class NKT_System():
 
         Set with set_bandpass()
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        self._bandwidth = (self._bandpass.long_setpoint
-                           - self._bandpass.short_setpoint)
+        with self.lock:
+            self._bandwidth = (self._bandpass.long_setpoint
+                               - self._bandpass.short_setpoint)
 
-        self.is_busy = False
         return self._bandwidth
 
     def set_bandpass(self, center, width):
@@ -136,18 +132,15 @@ class NKT_System():
         print("going into bandpass setting method, is_busy is - " + str(self.is_busy))
         if ((short_setpoint >= self.wavelength_range[0])
                 and (long_setpoint <= self.wavelength_range[1])):
-            while self.is_busy:
-                time.sleep(0)
-            self.is_busy = True
-            self._bandpass.short_setpoint = short_setpoint
-            self._bandpass.long_setpoint = long_setpoint
-            self._central_wavelength = center
-            self._bandwidth = width
-            # Reset Power setpoint [%] to keep constant output in mW
-            setpoint = determine_setpoint(self._calibration, self.P_set,
-                                          center, width)
-            self._laser.set_power(setpoint)  # Note this is power setpoint
-            self.is_busy = False
+            with self.lock:
+                self._bandpass.short_setpoint = short_setpoint
+                self._bandpass.long_setpoint = long_setpoint
+                self._central_wavelength = center
+                self._bandwidth = width
+                # Reset Power setpoint [%] to keep constant output in mW
+                setpoint = determine_setpoint(self._calibration, self.P_set,
+                                              center, width)
+                self._laser.set_power(setpoint)  # Note this is power setpoint
         else:
             print('Wavelength conditions outside range!')
 
@@ -175,24 +168,20 @@ class NKT_System():
         self.voice_control.runAndWait()
         self.voice_control.stop()
 
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # NKT cannot be set to 0% so turn off emission is user requests 0 power
-        if P_set == 0:
-            self._laser.set_emission(False)
+        with self.lock:
+            # NKT cannot be set to 0% so turn off emission if user requests 0
+            if P_set == 0:
+                self._laser.set_emission(False)
 
-        elif P_set > 0:  # Make sure emission is on
-            self._laser.set_emission(True)
+            elif P_set > 0:  # Make sure emission is on
+                self._laser.set_emission(True)
 
-            setpoint = determine_setpoint(self._calibration, P_set,
-                                          self._central_wavelength,
-                                          self._bandwidth)
-            print('Setpoint = ', setpoint)
-            self._laser.set_power(setpoint)
+                setpoint = determine_setpoint(self._calibration, P_set,
+                                              self._central_wavelength,
+                                              self._bandwidth)
+                print('Setpoint = ', setpoint)
+                self._laser.set_power(setpoint)
 
-        self.is_busy = False
         self._P_set = P_set
         print('\n', time.ctime())
         self.print_output()
@@ -217,19 +206,14 @@ class NKT_System():
         self.voice_control.runAndWait()
         self.voice_control.stop()
 
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
+        with self.lock:
+            # NKT cannot be set to 0% so turn off emission if user requests 0
+            if setpoint == 0:
+                self._laser.set_emission(False)
 
-        # NKT cannot be set to 0% so turn off emission is user requests 0 power
-        if setpoint == 0:
-            self._laser.set_emission(False)
-
-        elif setpoint > 0:  # Make sure emission is on
-            self._laser.set_emission(True)
-            self._laser.set_power(setpoint)
-
-        self.is_busy = False
+            elif setpoint > 0:  # Make sure emission is on
+                self._laser.set_emission(True)
+                self._laser.set_power(setpoint)
 
         print('\n', time.ctime())
         self.print_output()
@@ -247,19 +231,14 @@ class NKT_System():
         setpoint : float or int
             Power [%] rounded to nearest decimal point
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        if self._laser.emission_state == True:
-            setpoint = self._laser.power_level
-        elif self._laser.emission_state == False:
-            setpoint = 0
-        elif self._laser.emission_state == 'Unknown':
-            print('Unknown emission state')
-            setpoint = 0
-
-        self.is_busy = False
+        with self.lock:
+            if self._laser.emission_state == True:
+                setpoint = self._laser.power_level
+            elif self._laser.emission_state == False:
+                setpoint = 0
+            elif self._laser.emission_state == 'Unknown':
+                print('Unknown emission state')
+                setpoint = 0
 
         return (setpoint)
 
@@ -272,14 +251,9 @@ class NKT_System():
         P : float or int
             Power [mW] rounded to 3 decimal points
         """
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        state = self._laser.emission_state
-        current_setpoint = self._laser.power_level
-
-        self.is_busy = False
+        with self.lock:
+            state = self._laser.emission_state
+            current_setpoint = self._laser.power_level
 
         if state == True:
             setpoint = current_setpoint
@@ -297,27 +271,20 @@ class NKT_System():
 
     def print_output(self):
         """Print the bandpass settings, power setpoint, and expected power."""
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-        bandpass = (self._bandpass.short_setpoint,
-                    self._bandpass.long_setpoint)
-        print('Extreme/Fianium Setpoint = %4.1f %%' % self._laser.power_level)
-        print('Varia Filter set for %4.1f nm - %4.1f nm' % bandpass)
-        print('Expected System Output = %4.1f mW' % self._P_set)
-        self.is_busy = False
+        with self.lock:
+            bandpass = (self._bandpass.short_setpoint,
+                        self._bandpass.long_setpoint)
+            print('Extreme/Fianium Setpoint = %4.1f %%'
+                  % self._laser.power_level)
+            print('Varia Filter set for %4.1f nm - %4.1f nm' % bandpass)
+            print('Expected System Output = %4.1f mW' % self._P_set)
 
     def shut_down(self):
         """Set power of laser to 0 by turning off emission.
         Also lowers setpoint power to 12%."""
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        self._laser.set_emission(False)
-        self._laser.set_power(12)
-
-        self.is_busy = False
+        with self.lock:
+            self._laser.set_emission(False)
+            self._laser.set_power(12)
 
     def update_calibration(self, slope, intercept):
         """
@@ -339,10 +306,20 @@ class NKT_System():
         """
         Update calibration attr based on module level calibration file.
 
+        Calibrations saved as nkt_calibration.pkl by older versions are
+        converted to nkt_calibration.npz the first time they are read.
         Also prints out calibration date and values to console.
         """
+        if (not os.path.isfile(calibration_path)
+                and os.path.isfile(legacy_calibration_path)):
+            print('Converting nkt_calibration.pkl to nkt_calibration.npz')
+            NKTCalibration.from_frame(
+                pd.read_pickle(legacy_calibration_path)
+            ).save(calibration_path)
+            t = os.path.getmtime(legacy_calibration_path)
+            os.utime(calibration_path, (t, t))  # Keep calibration date
         try:
-            self._calibration = pd.read_pickle(calibration_path)
+            self._calibration = NKTCalibration.load(calibration_path)
             t = os.path.getmtime(calibration_path)
             print('Last laser calibration was:')
             print(dt.datetime.fromtimestamp(t).strftime('%Y-%m-%d'))
@@ -390,7 +367,6 @@ class NKT_System():
         float
             [mW] Maximum constant power for given parameters.
         """
-        data = []
         lambda_min = wavelength_range[0]
         lambda_max = wavelength_range[-1]
         lower_lim = self.wavelength_range[0]
@@ -401,12 +377,11 @@ class NKT_System():
                 and lower_lim < lambda_max <= upper_lim):
             return 0
 
-        # Predict power over given range, return smallest value
-        for wavelength in np.arange(lambda_min, lambda_max+0.01):
-            value = predict_power(self._calibration, 100, wavelength, bandwidth)
-            data.append(value)
-
-        return min(data)
+        # Predict power over given range at 100%, return smallest value
+        centers = np.arange(lambda_min, lambda_max+0.01)
+        p = self._calibration.window_coefficients(centers, bandwidth)
+        data = np.polyval(p.T, 100)
+        return data.min()
 
     def time_warning(self, time_left):
         """
@@ -429,8 +404,10 @@ class NKT_System():
         """
         Start the data log function to record the laser set point.
 
-        Records constantly until stop_logger() is called. Creates self.timer
-        and self.save_path when called.
+        Records constantly until stop_logger() is called. Creates self.logger
+        and self.save_path when called. Readings are buffered and written to
+        file in batches by an
+        :class:`~catalight.equipment.data_logger.EquipmentLogger`.
 
         Parameters
         ----------
@@ -438,63 +415,36 @@ class NKT_System():
             (seconds) interval to record data with. The default is 0.1 sec.
         save_path : `str`, optional
             Full tile path to save data to. If None, saves in module directory
-            with file name 'YYYYMMDDlaser_log.txt'. Appends int to end of file
+            with file name 'YYYYMMDDlaser_log.csv'. Appends int to end of file
             name if file name already exists.
         """
         if save_path is None:  # if savepath is unspecified, saves in cwd
             save_path = os.path.join(os.getcwd(),
-                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.txt')
+                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.csv')
         while os.path.isfile(save_path):  # check if log w/ default name exists
             m = 1
-            save_path = save_path.removesuffix('.txt')
+            save_path, ext = os.path.splitext(save_path)
             # checks if save_path has number at end
             if re.findall(r'\d+$', save_path):
                 m += int(re.findall(r'\d+$', save_path)[-1])
-            # append number and .txt to filename,
+            # append number and extension to filename,
             # then check if name still exists
             save_path = re.split(r'\d+$', save_path)[0] + str(m)
-            save_path = save_path + '.txt'
+            save_path = save_path + ext
 
         self.save_path = save_path  # assign local pathname to class attribute
-        # create update thread
-        self.timer = RepeatTimer(log_frequency, self.log_power)
-        self.timer.start()
-
-    def log_power(self):
-        """Append (date and current power setpoint) to the log at save_path."""
-        with open(self.save_path, 'a') as output_log:
-            entry = ('%s, %6.2f \n' % (dt.datetime.now(), self.P_set))
-            output_log.write(entry)
+        # Columns are time and P_set
+        self.logger = EquipmentLogger(save_path, interval=log_frequency)
+        self.logger.add_device('P_set', lambda: self.P_set)
+        self.logger.start()
 
     def stop_logger(self):
-        """Cancel timer initialized w/ start_logger() and delete it."""
-        if self.timer:
-            self.timer.cancel()
-            del self.timer
+        """Stop logger started w/ start_logger(), save data, and delete it."""
+        if getattr(self, 'logger', None):
+            self.logger.stop()
+            del self.logger
         else:
-            print('No Timer')
-
-
-class RepeatTimer(Timer):
-    """
-    Subclass of threading.Timer. Runs at interval until cancelled.
-
-    Parameters
-    ----------
-    interval : float or int
-        Time interval in seconds to call function.
-    function : `function`
-        Functions to call
-    args
-        Arguments of function.
-    kwargs
-        Key word arguments of function.
-    """
-
-    def run(self):
-        """Run function until finished supplying args and kwargs."""
-        while not self.finished.wait(self.interval):
-            self.function(*self.args, **self.kwargs)
+            print('No Logger')
 
 
 if __name__ == "__main__":
@@ -14,6 +14,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from catalight.equipment.light_sources import nkt_system
+from catalight.equipment.light_sources.nkt_helper_funcs import \
+    NKTCalibration
 from catalight.equipment.power_meter import newport
 from catalight.equipment.light_sources.nkt_collect_calibration \
     import make_measurement
@@ -59,7 +61,7 @@ def generate_data(calibration, num_measurements, laser_system, powermeter):
 
     Parameters
     ----------
-    calibration : pandas.DataFrame
+    calibration : NKTCalibration
         calibration fits for nkt_laser system
     num_measurements : int
         Number of random conditions to request for verfication
@@ -149,8 +151,8 @@ def main(laser_system, meter):
         Compatible power meter used for measurements
     """
     folder = os.path.dirname(os.path.abspath(__file__))
-    path = os.path.join(folder, "nkt_calibration.pkl")
-    calibration = pd.read_pickle(path)
+    path = os.path.join(folder, "nkt_calibration.npz")
+    calibration = NKTCalibration.load(path)
     results = generate_data(calibration, 50, laser_system, meter)
     plot_verification(results)
     print('Calibration verification finished')
@@ -161,8 +163,8 @@ if __name__ == '__main__':
     laser = nkt_system.NKT_System()
 
     path = (r"G:\Shared drives\Ensemble Photoreactor"
-            r"\Reactor Baseline Experiments\nkt_calibration\nkt_calibration.pkl")
-    calibration = pd.read_pickle(path)
+            r"\Reactor Baseline Experiments\nkt_calibration\nkt_calibration.npz")
+    calibration = NKTCalibration.load(path)
     results = generate_data(calibration, 50, laser, meter)
     fig, ax = plt.subplots()
     results.plot(ax=ax, x='requested_power', style='o')
@@ -7,13 +7,15 @@ import os
 import re
 import time
 from ctypes import POINTER, cast
-from threading import Timer
 
 import numpy as np
 import pyttsx3
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 
+from catalight.equipment.data_logger import EquipmentLogger
+from catalight.equipment.device_lock import DeviceLock
+
 # Sets path when file is imported
 package_dir = os.path.dirname(os.path.abspath(__file__))
 calibration_path = os.path.join(package_dir, 'nkt_calibration.csv')
@@ -26,10 +28,12 @@ class Template_Laser():
     """
     is_tunable = False
     """bool: Defines whether laser class is tunable."""
+    is_busy = property(lambda self: self.lock.is_busy)
+    """bool: True while a thread is using the device, read-only."""
 
     def __init__(self):
         # Set public attr
-        self.is_busy = False  #: Used to block access from multiple threads
+        self.lock = DeviceLock('Laser')  #: Device access lock
 
         self._calibration = [0, 0]
 
@@ -88,17 +92,14 @@ class Template_Laser():
         self.voice_control.runAndWait()
         self.voice_control.stop()
 
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO Device specific set power command
-        # Check manual to see if device power should be ramped slowly
-        # See diode_control for example
-        # ---------------------------------------------------------------------
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO Device specific set power command
+            # Check manual to see if device power should be ramped slowly
+            # See diode_control for example
+            # -----------------------------------------------------------------
+            pass
 
-        self.is_busy = False
         self._P_set = P_set
         print('\n', time.ctime())
         self.print_output()
@@ -129,15 +130,11 @@ class Template_Laser():
 
     def shut_down(self):
         """Set power of laser to 0 by setting DAQ Voltage to 0."""
-        while self.is_busy:
-            time.sleep(0)
-        self.is_busy = True
-
-        # ---------------------------------------------------------------------
-        # TODO turn off device in a way that doesn't rely on calibration
-        # ---------------------------------------------------------------------
-
-        self.is_busy = False
+        with self.lock:
+            # -----------------------------------------------------------------
+            # TODO turn off device in a way that doesn't rely on calibration
+            # -----------------------------------------------------------------
+            pass
 
     def update_calibration(self, slope, intercept):
         """
@@ -213,8 +210,10 @@ class Template_Laser():
         """
         Start the data log function to record the laser set point.
 
-        Records constantly until stop_logger() is called. Creates self.timer
-        and self.save_path when called.
+        Records constantly until stop_logger() is called. Creates self.logger
+        and self.save_path when called. Readings are buffered and written to
+        file in batches by an
+        :class:`~catalight.equipment.data_logger.EquipmentLogger`.
 
         Parameters
         ----------
@@ -222,63 +221,36 @@ class Template_Laser():
             (seconds) interval to record data with. The default is 0.1 sec.
         save_path : `str`, optional
             Full tile path to save data to. If None, saves in module directory
-            with file name 'YYYYMMDDlaser_log.txt'. Appends int to end of file
+            with file name 'YYYYMMDDlaser_log.csv'. Appends int to end of file
             name if file name already exists.
         """
         if save_path is None:  # if savepath is unspecified, saves in cwd
             save_path = os.path.join(os.getcwd(),
-                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.txt')
+                                     dt.date.today().strftime('%Y%m%d') + 'laser_log.csv')
         while os.path.isfile(save_path):  # check if log w/ default name exists
             m = 1
-            save_path = save_path.removesuffix('.txt')
+            save_path, ext = os.path.splitext(save_path)
             # checks if save_path has number at end
             if re.findall(r'\d+$', save_path):
                 m += int(re.findall(r'\d+$', save_path)[-1])
-            # append number and .txt to filename,
+            # append number and extension to filename,
             # then check if name still exists
             save_path = re.split(r'\d+$', save_path)[0] + str(m)
-            save_path = save_path + '.txt'
+            save_path = save_path + ext
 
         self.save_path = save_path  # assign local pathname to class attribute
-        # create update thread
-        self.timer = RepeatTimer(log_frequency, self.log_power)
-        self.timer.start()
-
-    def log_power(self):
-        """Append (date and current power setpoint) to the log at save_path."""
-        with open(self.save_path, 'a') as output_log:
-            entry = ('%s, %6.2f \n' % (dt.datetime.now(), self.P_set))
-            output_log.write(entry)
+        # Columns are time and P_set
+        self.logger = EquipmentLogger(save_path, interval=log_frequency)
+        self.logger.add_device('P_set', lambda: self.P_set)
+        self.logger.start()
 
     def stop_logger(self):
-        """Cancel timer initialized w/ start_logger() and delete it."""
-        if self.timer:
-            self.timer.cancel()
-            del self.timer
+        """Stop logger started w/ start_logger(), save data, and delete it."""
+        if getattr(self, 'logger', None):
+            self.logger.stop()
+            del self.logger
         else:
-            print('No Timer')
-
-
-class RepeatTimer(Timer):
-    """
-    Subclass of threading.Timer. Runs at interval until cancelled.
-
-    Parameters
-    ----------
-    interval : float or int
-        Time interval in seconds to call function.
-    function : `function`
-        Functions to call
-    args
-        Arguments of function.
-    kwargs
-        Key word arguments of function.
-    """
-
-    def run(self):
-        """Run function until finished supplying args and kwargs."""
-        while not self.finished.wait(self.interval):
-            self.function(*self.args, **self.kwargs)
+            print('No Logger')
 
 
 if __name__ == "__main__":
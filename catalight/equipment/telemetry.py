@@ -0,0 +1,232 @@
+"""
+Background sampling of equipment readings.
+
+Reading a heater temperature or MFC flow is a blocking serial transaction.
+:class:`TelemetrySampler` reads each device once per interval on its own
+thread and keeps the latest timestamped readings, so the GUI, experiment
+printouts, and loggers can share one reading instead of each querying the
+device. Slow devices only delay their own readings.
+
+Example
+-------
+>>> telemetry = TelemetrySampler(interval=0.5)
+>>> telemetry.add_source('heater', lambda: {'temp': heater.read_temp()})
+>>> telemetry.latest('heater', max_age=2)
+{'temp': 23.5}
+"""
+import threading
+import time
+from collections import deque
+
+
+class TelemetrySampler():
+    """
+    Poll devices on background threads and cache their latest readings.
+
+    Readings of each source are kept in a ring buffer (collections.deque with
+    maxlen) of (time, value) tuples. Appending and reading the last item of a
+    deque are atomic, so readers never wait on the sampling threads.
+
+    Parameters
+    ----------
+    interval : `float`, optional
+        Default time between readings of each source in seconds.
+        The default is 0.5.
+    history : `int`, optional
+        Number of readings kept per source. The default is 120.
+    """
+
+    def __init__(self, interval=0.5, history=120):
+        self.interval = interval
+        """Default time between readings of each source in seconds"""
+        self.history = history
+        """Number of readings kept per source"""
+        self._buffers = {}  # {name: deque of (time, value)}
+        self._threads = {}  # {name: (stop event, thread)}
+
+    @property
+    def sources(self):
+        """list[str]: Names of sources currently being sampled."""
+        return list(self._threads)
+
+    def add_source(self, name, read_func, interval=None):
+        """
+        Start sampling read_func on its own thread.
+
+        Replaces any source with the same name. Readings of a replaced source
+        are discarded.
+
+        Parameters
+        ----------
+        name : str
+            Name used to retrieve readings, e.g. 'heater'.
+        read_func : callable
+            Function without arguments returning the reading. Readings
+            returning None are not stored.
+        interval : `float`, optional
+            Time between readings in seconds. The default is None, which uses
+            the interval attribute.
+        """
+        self.remove_source(name)
+        if interval is None:
+            interval = self.interval
+        buffer = deque(maxlen=self.history)
+        stop_event = threading.Event()
+        thread = threading.Thread(target=self._poll,
+                                  args=(name, read_func, interval,
+                                        buffer, stop_event),
+                                  daemon=True)
+        self._buffers[name] = buffer
+        self._threads[name] = (stop_event, thread)
+        thread.start()
+
+    def remove_source(self, name):
+        """
+        Stop sampling a source and discard its readings.
+
+        The sampling thread exits after its current reading finishes.
+
+        Parameters
+        ----------
+        name : str
+            Name of source to remove. Unknown names are ignored.
+        """
+        if name in self._threads:
+            stop_event, _ = self._threads.pop(name)
+            stop_event.set()
+        self._buffers.pop(name, None)
+
+    def stop(self, timeout=None):
+        """
+        Stop all sources and wait for their threads to finish.
+
+        Parameters
+        ----------
+        timeout : `float`, optional
+            Maximum time to wait for each thread in seconds.
+            The default is None (wait until finished).
+        """
+        threads = list(self._threads.values())
+        for name in self.sources:
+            self.remove_source(name)
+        for _, thread in threads:
+            thread.join(timeout)
+
+    def snapshot(self, name, max_age=None):
+        """
+        Return the latest (time, value) reading of a source.
+
+        Parameters
+        ----------
+        name : str
+            Name of source.
+        max_age : `float`, optional
+            Return None if the reading is older than this in seconds.
+            The default is None (any age).
+
+        Returns
+        -------
+        tuple or None
+            (time.time() when read, value), or None if no valid reading.
+        """
+        buffer = self._buffers.get(name)
+        if not buffer:
+            return None
+        reading = buffer[-1]
+        if max_age is not None and time.time() - reading[0] > max_age:
+            return None
+        return reading
+
+    def latest(self, name, max_age=None):
+        """
+        Return the latest value of a source.
+
+        Parameters
+        ----------
+        name : str
+            Name of source.
+        max_age : `float`, optional
+            Return None if the reading is older than this in seconds.
+            The default is None (any age).
+
+        Returns
+        -------
+        object or None
+            Value returned by the source's read_func, or None if no valid
+            reading.
+        """
+        reading = self.snapshot(name, max_age)
+        return None if reading is None else reading[1]
+
+    def readings(self, name):
+        """
+        Return all buffered readings of a source.
+
+        Parameters
+        ----------
+        name : str
+            Name of source.
+
+        Returns
+        -------
+        list[tuple]
+            (time, value) readings from oldest to newest.
+        """
+        return list(self._buffers.get(name, []))
+
+    @staticmethod
+    def _poll(name, read_func, interval, buffer, stop_event):
+        """Read source every interval until stop_event is set."""
+        failed = False
+        while not stop_event.is_set():
+            start = time.time()
+            try:
+                value = read_func()
+            except Exception as e:
+                # Keep sampling, device may recover. Only print first error
+                if not failed:
+                    print('Telemetry read of %s failed:' % name, e)
+                failed = True
+            else:
+                failed = False
+                if value is not None and not stop_event.is_set():
+                    buffer.append((time.time(), value))
+            stop_event.wait(max(0, interval - (time.time() - start)))
+
+
+def read_laser(laser):
+    """
+    Read output power and bandpass settings of a laser for telemetry.
+
+    Parameters
+    ----------
+    laser : Diode_Laser or NKT_System
+        Connected laser.
+
+    Returns
+    -------
+    dict
+        {'power', 'P_set'} plus {'center', 'bandwidth'} for tunable lasers.
+    """
+    reading = {'power': laser.get_output_power(), 'P_set': laser.P_set}
+    if laser.is_tunable:
+        reading['center'] = laser.central_wavelength
+        reading['bandwidth'] = laser.bandwidth
+    return reading
+
+
+def read_heater(heater):
+    """
+    Read temperature and setpoint of a heater for telemetry.
+
+    Parameters
+    ----------
+    heater : Heater
+        Connected heater.
+
+    Returns
+    -------
+    dict
+        {'temp', 'setpoint'} in C.
+    """
+    return {'temp': heater.read_temp(), 'setpoint': heater.read_setpoint()}
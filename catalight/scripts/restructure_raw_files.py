@@ -18,7 +18,8 @@ import time
 
 import matplotlib.pyplot as plt
 import numpy as np
-from catalight.equipiment.experiment_control import Experiment
+from catalight.analysis.tools import PRUNED_DIRS, scan_data_dirs
+from catalight.equipment.experiment_control import Experiment
 
 
 def listfiles(folder_path):
@@ -299,11 +300,11 @@ elif Expt1.expt_type == 'power_sweep':
 else:
     raise ValueError('Experiment type not currently supported by program')
 
-# Finds bottom most directories (original experiments)
-sample_paths = []
-for dirpath, dirnames, filenames in os.walk(main_dir):
-    if not dirnames:
-        sample_paths.append(dirpath)
+# Finds directories containing FID data (original experiments)
+data_dirs = scan_data_dirs(main_dir, channels=('FID',), suffixes=('.asc',),
+                           prune=PRUNED_DIRS + ('uneditted_files',))
+sample_paths = [dirpath for dirpath, files in data_dirs.items()
+                if files[('FID', '.asc')]]
 
 # Loops through experiment dirs and reorganizes data within each
 for sample_path in sample_paths: